@@ -6,9 +6,348 @@ import json
 import os
 import argparse
 import sys
-from datetime import datetime
+import hashlib
+import bisect
+import threading
+import socket
+import sqlite3
+import heapq
+import math
+import mmap
+import struct
+import zlib
+import gzip
+import io
+import glob
+import shutil
+import contextlib
+import weakref
+import itertools
+import smtplib
+import secrets
+import unicodedata
+import tempfile
+import http.server
+from array import array
+from collections import Counter, deque
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
 from bs4 import BeautifulSoup
-from urllib.parse import quote_plus, urlparse
+from urllib.parse import parse_qs, quote_plus, unquote_plus, urlparse
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    import dns.resolver
+except ImportError:
+    dns = None
+
+# Wayback Machine CDX API settings
+WAYBACK_CDX_ENDPOINT = "https://web.archive.org/cdx/search/cdx"
+CDX_PAGE_SIZE = 5000
+CDX_MAX_PAGES = 50
+CDX_MAX_WORKERS = 4
+CDX_CACHE_TTL = 86400  # Seconds before a cached timeline is refreshed
+CACHE_DIR = ".osint_cache"
+
+# Perceptual image matching settings
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff")
+IMAGE_INDEX_BATCH = 1000  # Index entries appended per write while hashing
+IMAGE_MIH_MAGIC = b"OSINTMIH"
+IMAGE_MIH_HEADER = struct.Struct(">8sB7xQ")  # magic, chunk count, image count
+IMAGE_MIH_CHUNKS = 4  # 16-bit pHash chunks, each with its own sorted table
+IMAGE_MATCH_DISTANCE = 10
+IMAGE_MATCH_LIMIT = 25
+
+# Offline Pwned Passwords index settings
+PWNED_MAGIC = b"OSINTPWD"
+PWNED_HEADER = struct.Struct(">8sB7xQ")  # magic, hash length, record count
+PWNED_BUCKETS = 65536  # Records are bucketed by the first two hash bytes
+PWNED_SORT_CHUNK = 2000000
+PWNED_RANGE_PREFIX = 5  # Hex characters sent to the range API
+PWNED_LINE_PATTERN = re.compile(r"^(?:[0-9A-Fa-f]{32}|[0-9A-Fa-f]{40}):\d*$")  # NTLM or SHA-1 HASH:COUNT
+
+# Pivot engine settings
+PIVOT_MAX_DEPTH = 2
+PIVOT_BUDGET = 50  # Page fetches per run
+PIVOT_MAX_WORKERS = 4
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+HANDLE_PATTERN = re.compile(r"(?<![\w@.])@([A-Za-z0-9_]{3,30})\b")
+
+# Dork compiler settings
+GOOGLE_SEARCH_URL = "https://www.google.com/search?q="
+GOOGLE_MAX_QUERY_TERMS = 32
+GOOGLE_MAX_URL_LENGTH = 2048
+DORK_CATEGORIES = ("Google Dorks", "Professional Networks", "Data Breach Indicators")
+DORK_TOKEN_PATTERN = re.compile(r'\([^)]*\)|"[^"]*"|\S+')
+
+# Metrics settings
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_INTERVAL = 15  # Seconds between metrics file writes
+
+# Distributed work queue settings
+QUEUE_CHUNK_SIZE = 10  # Subjects per leased chunk
+QUEUE_LEASE_SECONDS = 600
+QUEUE_POLL_INTERVAL = 5
+
+# Compressed archive (.osa) settings
+ARCHIVE_MAGIC = b"OSINTARC"
+ARCHIVE_VERSION = 2  # Version 1 stored columns in native byte order
+ARCHIVE_TRAILER = struct.Struct(">QQ8s")  # footer offset, footer length, magic
+ARCHIVE_COMPRESSION_LEVEL = 6
+ARCHIVE_DICTIONARY_SIZE = 32768  # zlib window size
+ARCHIVE_NAME_TOKEN = "\x00"  # Stands in for the subject's name inside strings
+ARCHIVE_PREFIX_PATTERN = re.compile(r"^[a-z]+://[^/?#]*(?:/[^?#]*?)?(?:\?[^=&#]*=|/)")
+
+# Change detection settings
+SIMHASH_SHINGLE_SIZE = 3  # Words per shingle
+SIMHASH_THRESHOLD = 6  # Bits that may differ before content counts as changed
+WORD_PATTERN = re.compile(r"\w+")
+
+# Relevance ranking settings
+RANK_WEIGHTS = (2.0, 1.0, 1.0, 0.5, -2.0)  # identifier hits, name TF-IDF, provider prior, location agreement, error status
+RANK_DEFAULT_PRIOR = 0.3
+RANK_CATEGORY_PRIORS = {
+    "Image Search": 0.9,
+    "Username": 0.7,
+    "Email": 0.7,
+    "Social Media": 0.6,
+    "Phone": 0.6,
+    "Professional Networks": 0.5,
+    "Employment": 0.5,
+    "Education": 0.5,
+    "Domain": 0.4,
+    "People Directories": 0.4,
+    "Web Archives": 0.4,
+    "Public Records": 0.3,
+    "Relatives": 0.3,
+    "Google Dorks": 0.3,
+    "Data Breach Indicators": 0.2,
+    "Data Breach Resources": 0.1
+}
+
+# GitHub enrichment settings
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_CHUNK = 50  # Aliased user lookups per GraphQL request
+GITHUB_RATE_LIMIT_RESERVE = 0.1  # Start spreading requests out below this fraction of the quota
+GITHUB_ETAG_CACHE = os.path.join(CACHE_DIR, "github_etags.json")
+GITHUB_PROFILE_FIELDS = """
+    login name company location email websiteUrl url
+    organizations(first: 10) { nodes { login } }
+"""
+
+# Email permutation and SMTP verification settings
+EMAIL_PATTERNS = (
+    "{first}.{last}", "{first}{last}", "{f}{last}", "{f}.{last}", "{first}{l}", "{first}",
+    "{last}", "{last}.{first}", "{last}{first}", "{first}_{last}", "{first}-{last}", "{last}{f}", "{f}{l}"
+)
+FREE_EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "live.com", "aol.com",
+                      "icloud.com", "protonmail.com", "proton.me", "gmx.com", "mail.com", "yandex.com")
+SMTP_PORT = 25
+SMTP_TIMEOUT = 15
+SMTP_MAX_WORKERS = 8
+SMTP_MAX_PER_HOST = 2  # Concurrent connections per mail server
+
+class _MetricsShard:
+    """One thread's counters and histograms; its lifetime follows the thread's local storage"""
+    __slots__ = ("counters", "histograms", "__weakref__")
+    
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+def _merge_metrics(counters, histograms, shard_counters, shard_histograms):
+    """Add one shard's counters and histograms into the given totals"""
+    for key, value in shard_counters.copy().items():
+        counters[key] = counters.get(key, 0) + value
+    for key, histogram in shard_histograms.copy().items():
+        merged = histograms.setdefault(key, [0] * len(histogram))
+        for i, value in enumerate(list(histogram)):
+            merged[i] += value
+
+class Metrics:
+    """Counters, gauges and histograms kept in per-thread shards so updates never take a lock"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = {}
+        self._shards_lock = threading.Lock()
+        self._retired = ({}, {})
+        self._gauges = {}
+    
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            # Only a thread's first update registers its shard under the lock
+            shard = _MetricsShard()
+            with self._shards_lock:
+                self._shards[id(shard)] = (shard.counters, shard.histograms)
+            # Fold the shard into the retired totals once its thread is gone
+            weakref.finalize(shard, self._retire, id(shard))
+            self._local.shard = shard
+        return shard
+    
+    def _retire(self, shard_id):
+        with self._shards_lock:
+            counters, histograms = self._shards.pop(shard_id)
+            _merge_metrics(*self._retired, counters, histograms)
+    
+    def inc(self, name, labels=(), value=1):
+        """Add to a counter; names not ending in _total are summed and exposed as gauges"""
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+    
+    def observe(self, name, labels, value):
+        """Record a histogram sample"""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            # Per-bucket counts, then the +Inf bucket, then the sum
+            histogram = histograms[key] = [0] * (len(METRICS_LATENCY_BUCKETS) + 1) + [0.0]
+        histogram[bisect.bisect_left(METRICS_LATENCY_BUCKETS, value)] += 1
+        histogram[-1] += value
+    
+    def set_gauge(self, name, labels, value):
+        self._gauges[(name, labels)] = value
+    
+    def snapshot(self):
+        """Merge the retired totals and all live shards into (counters, histograms, gauges)"""
+        counters, histograms = {}, {}
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            _merge_metrics(counters, histograms, *self._retired)
+        for shard_counters, shard_histograms in shards:
+            _merge_metrics(counters, histograms, shard_counters, shard_histograms)
+        return counters, histograms, dict(self._gauges)
+    
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        counters, histograms, gauges = self.snapshot()
+    
+        # Derive the cache hit ratio from the hit/miss counters
+        lookups = {}
+        for (name, labels), value in counters.items():
+            if name == "osint_cache_requests_total":
+                labels = dict(labels)
+                hits, total = lookups.get(labels["cache"], (0, 0))
+                lookups[labels["cache"]] = (hits + (value if labels["result"] == "hit" else 0), total + value)
+        for cache, (hits, total) in lookups.items():
+            gauges[("osint_cache_hit_ratio", (("cache", cache),))] = hits / total if total else 0.0
+    
+        def series(name, labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return name
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+            return name + "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+    
+        lines = []
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+                typed.add(name)
+            lines.append(f"{series(name, labels)} {value}")
+        for (name, labels), value in sorted(gauges.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} gauge")
+                typed.add(name)
+            lines.append(f"{series(name, labels)} {value}")
+        for (name, labels), histogram in sorted(histograms.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip(METRICS_LATENCY_BUCKETS + ("+Inf",), histogram[:-1]):
+                cumulative += count
+                lines.append(f"{series(name + '_bucket', labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{series(name + '_sum', labels)} {histogram[-1]}")
+            lines.append(f"{series(name + '_count', labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
+
+def serve_metrics(port):
+    """Expose METRICS on /metrics from a background thread"""
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if urlparse(self.path).path != "/metrics":
+                self.send_error(404)
+                return
+            body = METRICS.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+        def log_message(self, format, *args):
+            pass
+    
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+    return server
+
+def write_metrics_file(path):
+    """Atomically write the current metrics to a file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(METRICS.render())
+    os.replace(temp_path, path)
+
+def start_metrics_file_writer(path, interval=METRICS_INTERVAL):
+    """Rewrite the metrics file every interval seconds from a background thread"""
+    def write_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_metrics_file(path)
+            except OSError as e:
+                print(f"Error writing metrics file: {e}")
+    
+    threading.Thread(target=write_loop, daemon=True).start()
+
+def http_get(url, **kwargs):
+    """requests.get that records per-host latency and status metrics"""
+    return http_request("GET", url, **kwargs)
+
+def http_request(method, url, **kwargs):
+    """requests.request that records per-host latency and status metrics"""
+    host = urlparse(url).netloc
+    start = time.perf_counter()
+    try:
+        response = requests.request(method, url, **kwargs)
+    except requests.RequestException:
+        METRICS.inc("osint_http_requests_total", (("host", host), ("status", "error")))
+        raise
+    finally:
+        METRICS.observe("osint_http_request_seconds", (("host", host),), time.perf_counter() - start)
+    METRICS.inc("osint_http_requests_total", (("host", host), ("status", str(response.status_code))))
+    return response
+
+def tracked_worker(pool, func):
+    """Wrap a worker function so busy workers in a pool are counted"""
+    def wrapper(*args):
+        METRICS.inc("osint_workers_busy", (("pool", pool),))
+        try:
+            return func(*args)
+        finally:
+            METRICS.inc("osint_workers_busy", (("pool", pool),), -1)
+    return wrapper
 
 class EnhancedOSINTSearcher:
     def __init__(self):
@@ -24,6 +363,7 @@ class EnhancedOSINTSearcher:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
         }
         self.output_file = None
+        self.github_token = os.environ.get("GITHUB_TOKEN")
         
     def interactive_mode(self):
         """Run the tool in interactive mode, gathering input from the user"""
@@ -96,8 +436,8 @@ class EnhancedOSINTSearcher:
             self.output_file = default_filename
         
         # Output format
-        output_format = input("Output format (json or txt, default: json): ").strip().lower()
-        if output_format not in ["json", "txt"]:
+        output_format = input("Output format (json, txt or osa, default: json): ").strip().lower()
+        if output_format not in ["json", "txt", "osa"]:
             output_format = "json"
         self.results["metadata"]["output_format"] = output_format
         
@@ -105,6 +445,10 @@ class EnhancedOSINTSearcher:
         open_browser = input("Open results in browser? (y/n, default: n): ").strip().lower()
         self.results["metadata"]["open_browser"] = open_browser == "y"
         
+        # Advanced stages are only enabled from the command line
+        for flag in ("use_dorking", "check_breaches", "search_archives", "search_professional"):
+            self.results["metadata"][flag] = False
+        
         return True
         
     def search_person(self):
@@ -360,6 +704,23 @@ class EnhancedOSINTSearcher:
             }
             print(f"✓ Generated {search_name}")
     
+    def search_by_domain(self, domain):
+        """Search based on domain name"""
+        name = self.results["subject_info"]["name"]
+        
+        domain_searches = {
+            f"WHOIS ({domain})": f"https://who.is/whois/{quote_plus(domain)}",
+            f"Site Search ({domain})": f"https://www.google.com/search?q=site:{quote_plus(domain)}+{quote_plus(name)}"
+        }
+        
+        for search_name, url in domain_searches.items():
+            self.results["search_results"][search_name] = {
+                "url": url,
+                "category": "Domain",
+                "info": f"Information linked to domain: {domain}"
+            }
+            print(f"✓ Generated {search_name}")
+    
     def search_by_employer(self, employer):
         """Search based on employer information"""
         name = self.results["subject_info"]["name"]
@@ -430,6 +791,10 @@ class EnhancedOSINTSearcher:
                 "info": f"Upload the image at {self.results['subject_info']['photo_path']} to this service"
             }
             print(f"✓ Generated {search_name}")
+        
+        # Match against a local image corpus if one was given
+        if self.results["metadata"].get("image_corpus"):
+            self.match_image_corpus(self.results["metadata"]["image_corpus"])
     
     def display_results(self):
         """Display search results in a readable format"""
@@ -458,6 +823,8 @@ class EnhancedOSINTSearcher:
                 print(f"• {source}")
                 print(f"  URL: {data['url']}")
                 print(f"  Info: {data['info']}")
+                if data.get("change"):
+                    print(f"  Change: {data['change'].replace('_', ' ')}")
                 print()
         
         print(f"\nResults saved to: {self.output_file}.{self.results['metadata']['output_format']}")
@@ -471,7 +838,7 @@ class EnhancedOSINTSearcher:
             if format_type == "json":
                 with open(filename, 'w') as f:
                     json.dump(self.results, f, indent=4)
-            else:  # txt format
+            elif format_type == "txt":
                 with open(filename, 'w') as f:
                     f.write(f"OSINT SEARCH RESULTS FOR: {self.results['subject_info']['name']}\n")
                     f.write(f"Generated on: {self.results['metadata']['timestamp']}\n")
@@ -504,7 +871,13 @@ class EnhancedOSINTSearcher:
                         for source, data in items:
                             f.write(f"• {source}\n")
                             f.write(f"  URL: {data['url']}\n")
-                            f.write(f"  Info: {data['info']}\n\n")
+                            f.write(f"  Info: {data['info']}\n")
+                            if data.get("change"):
+                                f.write(f"  Change: {data['change'].replace('_', ' ')}\n")
+                            f.write("\n")
+            elif format_type == "osa":
+                with ArchiveWriter(filename) as archive:
+                    archive.add(self.results)
             
             print(f"\nResults successfully saved to {filename}")
             
@@ -526,40 +899,13 @@ class EnhancedOSINTSearcher:
             print("Browser opening cancelled.")
             return
         
-        # Open results by category for better organization
-        categories = {}
-        for source, data in self.results["search_results"].items():
-            category = data["category"]
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((source, data))
-        
-        # Open one from each category first
-        for category, items in categories.items():
-            if opened >= limit:
-                break
-                
-            source, data = items[0]
+        # Open the most relevant results first
+        for source, data in self.top_results(limit):
             webbrowser.open(data["url"])
             print(f"Opened: {source}")
             opened += 1
             time.sleep(1)  # Delay to prevent overwhelming the browser
         
-        # Open remaining results up to the limit
-        for category, items in categories.items():
-            if opened >= limit:
-                break
-                
-            # Skip the first one since we've already opened it
-            for source, data in items[1:]:
-                if opened >= limit:
-                    break
-                    
-                webbrowser.open(data["url"])
-                print(f"Opened: {source}")
-                opened += 1
-                time.sleep(1)  # Delay to prevent overwhelming the browser
-        
         if opened == limit and len(self.results["search_results"]) > limit:
             print(f"Limit of {limit} results reached. {len(self.results['search_results']) - limit} results not opened.")
             print(f"All results are available in the saved file: {self.output_file}.{self.results['metadata']['output_format']}")
@@ -671,6 +1017,10 @@ def search_dark_web_indicators(self):
         }
         print(f"✓ Generated indicator search: {indicator_name}")
     
+    # Check audit passwords against an offline Pwned Passwords index if provided
+    if self.results["metadata"].get("pwned_db") and self.results["metadata"].get("password_file"):
+        self.check_pwned_passwords(self.results["metadata"]["pwned_db"], self.results["metadata"]["password_file"])
+    
     return len(dark_web_searches) + len(breach_indicators)
 
 def search_archived_content(self):
@@ -686,6 +1036,9 @@ def search_archived_content(self):
         "Archive.today Name Search": f"https://archive.ph/?q={encoded_name}"
     }
     
+    # URL patterns to query through the CDX API, keyed by the Wayback search they belong to
+    cdx_patterns = {}
+    
     # Add social media archive searches if usernames are available
     if self.results["subject_info"].get("usernames"):
         for username in self.results["subject_info"]["usernames"]:
@@ -693,18 +1046,25 @@ def search_archived_content(self):
             archive_searches[f"Wayback - Twitter/{username}"] = f"https://web.archive.org/web/*/twitter.com/{encoded_username}"
             archive_searches[f"Wayback - Instagram/{username}"] = f"https://web.archive.org/web/*/instagram.com/{encoded_username}"
             archive_searches[f"Wayback - Facebook/{username}"] = f"https://web.archive.org/web/*/facebook.com/{encoded_username}"
+            cdx_patterns[f"Wayback - Twitter/{username}"] = f"twitter.com/{encoded_username}"
+            cdx_patterns[f"Wayback - Instagram/{username}"] = f"instagram.com/{encoded_username}"
+            cdx_patterns[f"Wayback - Facebook/{username}"] = f"facebook.com/{encoded_username}"
     
     # Add website archive searches if domain names can be extracted from emails
     if self.results["subject_info"].get("emails"):
         domains = set()
         for email in self.results["subject_info"]["emails"]:
             if '@' in email:
-                domain = email.split('@')[-1]
+                domain = email.split('@')[-1].lower()
                 domains.add(domain)
         
+        # Webmail domains say nothing about the subject
+        domains -= set(FREE_EMAIL_DOMAINS)
+        
         for domain in domains:
             archive_searches[f"Wayback - {domain}"] = f"https://web.archive.org/web/*/{domain}"
             archive_searches[f"Archive.today - {domain}"] = f"https://archive.ph/domain/{domain}"
+            cdx_patterns[f"Wayback - {domain}"] = f"{domain}/*"
     
     # Add all archive searches to results
     for archive_name, url in archive_searches.items():
@@ -715,8 +1075,140 @@ def search_archived_content(self):
         }
         print(f"✓ Generated archive search: {archive_name}")
     
+    # Query the CDX API for capture timelines if requested
+    if self.results["metadata"].get("cdx_lookup") and cdx_patterns:
+        self.query_wayback_timelines(cdx_patterns)
+    
     return len(archive_searches)
 
+def query_wayback_timelines(self, cdx_patterns):
+    """Query the Wayback CDX API for each pattern and attach capture timelines to the results"""
+    print("\nQuerying Wayback CDX API for capture timelines...")
+    
+    # Bound the number of concurrent CDX queries
+    METRICS.set_gauge("osint_workers", (("pool", "cdx"),), CDX_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=CDX_MAX_WORKERS) as executor:
+        timelines = dict(zip(cdx_patterns, executor.map(tracked_worker("cdx", self.get_cdx_timeline), cdx_patterns.values())))
+    
+    for archive_name, timeline in timelines.items():
+        if timeline is None:
+            continue
+        result = self.results["search_results"][archive_name]
+        result["timeline"] = timeline
+        truncated = " (truncated)" if timeline["truncated"] else ""
+        if timeline["capture_days"]:
+            result["info"] = (f"Archived content search: {archive_name} "
+                              f"({timeline['capture_days']} days with captures{truncated}, {timeline['distinct_digests']} distinct versions, "
+                              f"first seen {timeline['first_seen']}, last seen {timeline['last_seen']})")
+        else:
+            result["info"] = f"Archived content search: {archive_name} (no captures found)"
+        print(f"✓ Retrieved timeline: {archive_name} ({timeline['capture_days']} days with captures{truncated})")
+    
+    return timelines
+
+def get_cdx_timeline(self, url_pattern):
+    """Build a capture timeline for a URL pattern, using the on-disk cache when available"""
+    endpoint = self.results["metadata"].get("cdx_endpoint", WAYBACK_CDX_ENDPOINT)
+    cache_key = hashlib.sha1(f"{endpoint}|{url_pattern}".encode("utf-8")).hexdigest()
+    cache_file = os.path.join(CACHE_DIR, f"cdx_{cache_key}.json")
+    
+    # Cached timelines expire so that new captures show up on later runs
+    if os.path.exists(cache_file) and time.time() - os.path.getmtime(cache_file) < CDX_CACHE_TTL:
+        try:
+            with open(cache_file, 'r') as f:
+                timeline = json.load(f)
+            METRICS.inc("osint_cache_requests_total", (("cache", "cdx"), ("result", "hit")))
+            return timeline
+        except (OSError, ValueError):
+            pass
+    METRICS.inc("osint_cache_requests_total", (("cache", "cdx"), ("result", "miss")))
+    
+    timeline = {
+        "url_pattern": url_pattern,
+        "first_seen": None,
+        "last_seen": None,
+        "capture_days": 0,  # Rows are collapsed to one capture per day
+        "distinct_digests": 0,
+        "truncated": False
+    }
+    digests = set()
+    status = {}
+    
+    try:
+        # Rows are folded into the timeline as they arrive, never held in memory
+        for row in self.iter_cdx_rows(endpoint, url_pattern, status):
+            if len(row) < 3:
+                continue
+            timestamp, digest = row[0], row[2]
+            if timeline["first_seen"] is None or timestamp < timeline["first_seen"]:
+                timeline["first_seen"] = timestamp
+            if timeline["last_seen"] is None or timestamp > timeline["last_seen"]:
+                timeline["last_seen"] = timestamp
+            timeline["capture_days"] += 1
+            digests.add(digest)
+    except requests.RequestException as e:
+        print(f"Error querying CDX API for {url_pattern}: {e}")
+        return None
+    
+    timeline["distinct_digests"] = len(digests)
+    timeline["truncated"] = status.get("truncated", False)
+    for key in ("first_seen", "last_seen"):
+        if timeline[key]:
+            timeline[key] = datetime.strptime(timeline[key][:14].ljust(14, "0"), "%Y%m%d%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+    
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump(timeline, f)
+    except OSError as e:
+        print(f"Error caching CDX timeline: {e}")
+    
+    return timeline
+
+def iter_cdx_rows(self, endpoint, url_pattern, status=None):
+    """Stream CDX rows for a URL pattern, following resume keys across pages
+    
+    If status is given, status["truncated"] is set when rows remain after CDX_MAX_PAGES pages.
+    """
+    resume_key = None
+    
+    for _ in range(CDX_MAX_PAGES):
+        params = {
+            "url": url_pattern,
+            "fl": "timestamp,statuscode,digest",
+            "collapse": "timestamp:8",  # At most one capture per day
+            "limit": CDX_PAGE_SIZE,
+            "showResumeKey": "true"
+        }
+        if resume_key:
+            params["resumeKey"] = resume_key
+    
+        response = http_get(endpoint, params=params, headers=self.headers, stream=True, timeout=30)
+        try:
+            response.raise_for_status()
+    
+            # The resume key follows a blank line at the end of the page
+            resume_key = None
+            after_blank = False
+            for line in response.iter_lines(decode_unicode=True):
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8", "replace")
+                line = line.strip() if line else ""
+                if not line:
+                    after_blank = True
+                elif after_blank:
+                    resume_key = line
+                else:
+                    yield line.split()
+        finally:
+            response.close()
+    
+        if not resume_key:
+            break
+    
+    if status is not None:
+        status["truncated"] = bool(resume_key)
+
 def search_professional_networks(self):
     """Search for professional information and company connections"""
     print("\nGenerating professional network searches...")
@@ -753,6 +1245,1950 @@ def search_professional_networks(self):
     
     return len(professional_searches)
 
+def compute_image_hashes(image_path):
+    """Compute aHash, dHash and pHash (64-bit each) for an image file"""
+    with Image.open(image_path) as img:
+        gray = img.convert("L")
+        small = np.asarray(gray.resize((8, 8), Image.LANCZOS), dtype=np.float64)
+        wide = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.float64)
+        large = np.asarray(gray.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    
+    # Average hash: pixels brighter than the mean
+    ahash_bits = small > small.mean()
+    
+    # Difference hash: horizontal gradient direction
+    dhash_bits = wide[:, 1:] > wide[:, :-1]
+    
+    # Perceptual hash: low-frequency DCT coefficients above their median
+    dct = _DCT_MATRIX @ large @ _DCT_MATRIX.T
+    low = dct[:8, :8].flatten()
+    phash_bits = low > np.median(low[1:])
+    
+    return {
+        "ahash": int.from_bytes(np.packbits(ahash_bits).tobytes(), "big"),
+        "dhash": int.from_bytes(np.packbits(dhash_bits).tobytes(), "big"),
+        "phash": int.from_bytes(np.packbits(phash_bits).tobytes(), "big")
+    }
+
+def _dct_matrix(size):
+    """Orthonormal DCT-II basis used by pHash"""
+    k = np.arange(size).reshape(-1, 1)
+    n = np.arange(size).reshape(1, -1)
+    matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+_DCT_MATRIX = _dct_matrix(32) if np is not None else None
+
+def _hash_image_entry(image_path):
+    """Hash one corpus image, returning None for unreadable files"""
+    try:
+        return compute_image_hashes(image_path)
+    except Exception:
+        return None
+
+def hamming_distance(a, b):
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count("1")
+
+class ImageHashTable:
+    """Memory-mapped multi-index hash table over pHash for Hamming-distance lookups
+    
+    The 64-bit pHash is split into IMAGE_MIH_CHUNKS chunks, each with its own sorted
+    (chunk value, image id) table. Two hashes within distance r must agree to within
+    r // IMAGE_MIH_CHUNKS bits on at least one chunk, so only the table rows near the
+    query's chunks are read.
+    """
+    
+    def __init__(self, table_path):
+        self.file = open(table_path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, chunks, self.count = IMAGE_MIH_HEADER.unpack_from(self.mm, 0)
+        if magic != IMAGE_MIH_MAGIC or chunks != IMAGE_MIH_CHUNKS:
+            self.close()
+            raise ValueError(f"{table_path} is not an image hash table")
+        offset = IMAGE_MIH_HEADER.size
+        self.hashes = np.frombuffer(self.mm, dtype=">u8", count=3 * self.count, offset=offset).reshape(-1, 3)
+        offset += 24 * self.count
+        self.tables = []
+        for _ in range(IMAGE_MIH_CHUNKS):
+            self.tables.append(np.frombuffer(self.mm, dtype=">u8", count=self.count, offset=offset))
+            offset += 8 * self.count
+        self.path_offsets = np.frombuffer(self.mm, dtype=">u8", count=self.count + 1, offset=offset)
+        self.paths_offset = offset + 8 * (self.count + 1)
+    
+    def close(self):
+        # numpy views hold buffer exports on the map, drop them first
+        self.hashes = self.tables = self.path_offsets = None
+        self.mm.close()
+        self.file.close()
+    
+    @staticmethod
+    def write(table_path, entries):
+        """Write a table for index entries (dicts with path, phash, ahash and dhash)"""
+        hashes = np.array([(entry["phash"], entry["ahash"], entry["dhash"]) for entry in entries], dtype=np.uint64).reshape(-1, 3)
+        ids = np.arange(len(entries), dtype=np.uint64)
+        paths = [entry["path"].encode("utf-8") for entry in entries]
+        path_offsets = np.zeros(len(paths) + 1, dtype=np.uint64)
+        np.cumsum([len(path) for path in paths], out=path_offsets[1:])
+        
+        temp_path = table_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(IMAGE_MIH_HEADER.pack(IMAGE_MIH_MAGIC, IMAGE_MIH_CHUNKS, len(entries)))
+            f.write(hashes.astype(">u8").tobytes())
+            for chunk in range(IMAGE_MIH_CHUNKS):
+                keys = (ImageHashTable._chunk(hashes[:, 0], chunk) << np.uint64(32)) | ids
+                keys.sort()
+                f.write(keys.astype(">u8").tobytes())
+            f.write(path_offsets.astype(">u8").tobytes())
+            f.write(b"".join(paths))
+        os.replace(temp_path, table_path)
+    
+    @staticmethod
+    def _chunk(values, chunk):
+        bits = 64 // IMAGE_MIH_CHUNKS
+        shift = np.uint64(64 - bits * (chunk + 1))
+        return (values >> shift) & np.uint64((1 << bits) - 1)
+    
+    @staticmethod
+    def _neighbour_masks(radius):
+        """XOR masks for every chunk value within radius bits"""
+        bits = 64 // IMAGE_MIH_CHUNKS
+        masks = [0]
+        for distance in range(1, radius + 1):
+            for positions in itertools.combinations(range(bits), distance):
+                masks.append(sum(1 << position for position in positions))
+        return np.array(masks, dtype=np.uint64)
+    
+    def path(self, image_id):
+        start, end = int(self.path_offsets[image_id]), int(self.path_offsets[image_id + 1])
+        offset = self.paths_offset + start
+        return self.mm[offset:offset + end - start].decode("utf-8")
+    
+    def search(self, phash, max_distance):
+        """Return (distance, entry) pairs within max_distance of phash, nearest first"""
+        if not self.count:
+            return []
+        masks = self._neighbour_masks(max_distance // IMAGE_MIH_CHUNKS)
+        query = np.array([phash], dtype=np.uint64)
+        candidates = set()
+        for chunk, table in enumerate(self.tables):
+            probes = ((self._chunk(query, chunk) ^ masks) << np.uint64(32)).astype(">u8")
+            lows = np.searchsorted(table, probes)
+            highs = np.searchsorted(table, (probes | np.uint64(0xFFFFFFFF)).astype(">u8"), side="right")
+            for low, high in zip(lows, highs):
+                if high > low:
+                    candidates.update(int(key) & 0xFFFFFFFF for key in table[low:high])
+        
+        matches = []
+        for image_id in candidates:
+            image_phash, image_ahash, image_dhash = (int(value) for value in self.hashes[image_id])
+            distance = hamming_distance(phash, image_phash)
+            if distance <= max_distance:
+                matches.append((distance, {"path": self.path(image_id), "phash": image_phash,
+                                           "ahash": image_ahash, "dhash": image_dhash}))
+        return sorted(matches, key=lambda match: match[0])
+
+def image_index_paths(corpus_dir):
+    """Locations of the JSON-lines index and the hash table for a corpus directory"""
+    corpus_key = hashlib.sha1(os.path.abspath(corpus_dir).encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(CACHE_DIR, f"image_{corpus_key}")
+    return base + ".jsonl", base + ".mih"
+
+def build_image_index(self, corpus_dir):
+    """Incrementally hash every image under corpus_dir, rebuilding its hash table if anything changed"""
+    index_path, table_path = image_index_paths(corpus_dir)
+    index = {}
+    lines = 0
+    if os.path.exists(index_path):
+        with open(index_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                # Later lines supersede earlier ones for the same path
+                index[entry["path"]] = entry
+                lines += 1
+    
+    # Only hash files that are new or changed since the last run
+    pending = []
+    seen = set()
+    for root, _, files in os.walk(corpus_dir):
+        for file_name in files:
+            if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.abspath(os.path.join(root, file_name))
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Broken symlink or a file removed during the walk
+                continue
+            seen.add(path)
+            entry = index.get(path)
+            if entry is None or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size:
+                pending.append((path, stat.st_mtime, stat.st_size))
+                METRICS.inc("osint_cache_requests_total", (("cache", "image_index"), ("result", "miss")))
+            else:
+                METRICS.inc("osint_cache_requests_total", (("cache", "image_index"), ("result", "hit")))
+    
+    # Files that were indexed but are gone now
+    removed = [path for path in index if path not in seen]
+    if not pending and not removed and os.path.exists(table_path):
+        return table_path
+    
+    for path in removed:
+        del index[path]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if pending:
+        print(f"Hashing {len(pending)} new or changed images...")
+        # Entries are appended in batches so an interrupted run keeps the work done so far
+        with ProcessPoolExecutor() as executor, open(index_path, 'a') as f:
+            hashes = executor.map(_hash_image_entry, [path for path, _, _ in pending], chunksize=64)
+            batch = []
+            for (path, mtime, size), image_hashes in zip(pending, hashes):
+                # Unreadable files are recorded too so they are not retried until they change
+                index[path] = dict(image_hashes or {}, path=path, mtime=mtime, size=size)
+                batch.append(json.dumps(index[path]) + "\n")
+                if len(batch) >= IMAGE_INDEX_BATCH:
+                    f.writelines(batch)
+                    f.flush()
+                    batch.clear()
+            f.writelines(batch)
+        lines += len(pending)
+    
+    # Compact the index when files were removed or superseded lines make up most of it
+    if removed or lines > 2 * len(index):
+        with open(index_path + ".tmp", 'w') as f:
+            for entry in index.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(index_path + ".tmp", index_path)
+    ImageHashTable.write(table_path, [entry for entry in index.values() if "phash" in entry])
+    return table_path
+
+def match_image_corpus(self, corpus_dir):
+    """Find near-duplicates of the subject photo in a local image corpus"""
+    if np is None or Image is None:
+        print("Error: numpy and Pillow are required for image matching.")
+        return 0
+    
+    print("\nMatching subject photo against local image corpus...")
+    try:
+        subject_hashes = compute_image_hashes(self.results["subject_info"]["photo_path"])
+    except Exception as e:
+        print(f"Error hashing subject photo: {e}")
+        return 0
+    
+    if self.results["metadata"].get("image_refresh", True):
+        table_path = self.build_image_index(corpus_dir)
+    else:
+        _, table_path = image_index_paths(corpus_dir)
+        if not os.path.exists(table_path):
+            print(f"Error: {corpus_dir} has not been indexed yet; run once without --no-image-refresh.")
+            return 0
+    
+    table = ImageHashTable(table_path)
+    try:
+        # pHash drives the lookup, aHash/dHash are reported for confirmation
+        matches = table.search(subject_hashes["phash"], IMAGE_MATCH_DISTANCE)[:IMAGE_MATCH_LIMIT]
+        indexed = table.count
+    finally:
+        table.close()
+    
+    for distance, entry in matches:
+        ahash_distance = hamming_distance(subject_hashes["ahash"], entry["ahash"])
+        dhash_distance = hamming_distance(subject_hashes["dhash"], entry["dhash"])
+        self.results["search_results"][f"Image Match ({entry['path']})"] = {
+            "url": f"file://{entry['path']}",
+            "category": "Image Search",
+            "info": f"Near-duplicate of subject photo (pHash distance {distance}, dHash {dhash_distance}, aHash {ahash_distance})"
+        }
+        print(f"✓ Matched image: {entry['path']} (distance {distance})")
+    
+    print(f"Searched {indexed} indexed images, found {len(matches)} matches")
+    return len(matches)
+
+def _iter_pwned_run(path, record_size):
+    """Yield fixed-size records from a sorted run file"""
+    with open(path, 'rb') as f:
+        while True:
+            record = f.read(record_size)
+            if len(record) < record_size:
+                break
+            yield record
+
+def ingest_pwned_passwords(corpus_path, db_path):
+    """Convert a Pwned Passwords HASH:COUNT text corpus into a sorted binary index"""
+    print(f"\nIngesting Pwned Passwords corpus: {corpus_path}")
+    hash_len = None
+    runs = []
+    chunk = []
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Sort the corpus in bounded chunks so any input order is accepted
+        def flush_chunk():
+            chunk.sort()
+            run_path = os.path.join(temp_dir, f"run_{len(runs)}.bin")
+            with open(run_path, 'wb') as run:
+                run.write(b"".join(chunk))
+            runs.append(run_path)
+            chunk.clear()
+    
+        with open(corpus_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                # Headers, blank lines and garbage are skipped rather than aborting the ingest
+                if not PWNED_LINE_PATTERN.match(line):
+                    continue
+                hash_hex, _, count = line.partition(":")
+                if hash_len is None:
+                    hash_len = len(hash_hex) // 2
+                if len(hash_hex) != hash_len * 2:
+                    continue
+                chunk.append(bytes.fromhex(hash_hex) + struct.pack(">I", min(int(count or 0), 0xFFFFFFFF)))
+                if len(chunk) >= PWNED_SORT_CHUNK:
+                    flush_chunk()
+            if chunk:
+                flush_chunk()
+    
+        if hash_len is None:
+            print("Error: corpus contains no hashes.")
+            return 0
+    
+        record_size = hash_len + 4
+        buckets = [0] * (PWNED_BUCKETS + 1)
+        total = 0
+    
+        with open(db_path, 'wb') as db:
+            # Header and bucket table are rewritten once the counts are known
+            db.write(PWNED_HEADER.pack(PWNED_MAGIC, hash_len, 0))
+            db.write(b"\0" * (8 * (PWNED_BUCKETS + 1)))
+    
+            previous = None
+            for record in heapq.merge(*[_iter_pwned_run(run, record_size) for run in runs]):
+                if previous is not None and record[:hash_len] == previous[:hash_len]:
+                    # Merge duplicate hashes by summing their counts
+                    count = struct.unpack(">I", previous[hash_len:])[0] + struct.unpack(">I", record[hash_len:])[0]
+                    previous = previous[:hash_len] + struct.pack(">I", min(count, 0xFFFFFFFF))
+                    continue
+                if previous is not None:
+                    db.write(previous)
+                    buckets[(previous[0] << 8 | previous[1]) + 1] += 1
+                    total += 1
+                previous = record
+            if previous is not None:
+                db.write(previous)
+                buckets[(previous[0] << 8 | previous[1]) + 1] += 1
+                total += 1
+    
+            # Convert per-bucket counts into cumulative record offsets
+            for i in range(1, PWNED_BUCKETS + 1):
+                buckets[i] += buckets[i - 1]
+            db.seek(0)
+            db.write(PWNED_HEADER.pack(PWNED_MAGIC, hash_len, total))
+            db.write(struct.pack(f">{PWNED_BUCKETS + 1}Q", *buckets))
+    
+    print(f"✓ Indexed {total} hashes into {db_path}")
+    return total
+
+class PwnedPasswordsIndex:
+    """Memory-mapped lookups into a binary index built by ingest_pwned_passwords"""
+    
+    def __init__(self, db_path):
+        self.file = open(db_path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.hash_len, self.count = PWNED_HEADER.unpack_from(self.mm, 0)
+        if magic != PWNED_MAGIC:
+            self.close()
+            raise ValueError(f"{db_path} is not a Pwned Passwords index")
+        self.record_size = self.hash_len + 4
+        self.table_offset = PWNED_HEADER.size
+        self.data_offset = self.table_offset + 8 * (PWNED_BUCKETS + 1)
+    
+    def close(self):
+        self.mm.close()
+        self.file.close()
+    
+    def _bucket(self, bucket):
+        """Record index range [lo, hi) for a two-byte prefix bucket"""
+        return struct.unpack_from(">QQ", self.mm, self.table_offset + 8 * bucket)
+    
+    def _key(self, index):
+        offset = self.data_offset + index * self.record_size
+        return self.mm[offset:offset + self.hash_len]
+    
+    def _count(self, index):
+        offset = self.data_offset + index * self.record_size + self.hash_len
+        return struct.unpack_from(">I", self.mm, offset)[0]
+    
+    def _lower_bound(self, key, lo, hi):
+        """First record index in [lo, hi) whose hash is >= key"""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid)[:len(key)] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def lookup(self, hash_hex):
+        """Return the breach count for a full hash, or 0 if it is not present"""
+        key = bytes.fromhex(hash_hex)
+        if len(key) != self.hash_len:
+            raise ValueError(f"Expected a {self.hash_len * 2}-character hash")
+        lo, hi = self._bucket(key[0] << 8 | key[1])
+        index = self._lower_bound(key, lo, hi)
+        if index < hi and self._key(index) == key:
+            return self._count(index)
+        return 0
+    
+    def range(self, prefix):
+        """Return (suffix, count) pairs for a hex prefix, like the public range API"""
+        prefix = prefix.upper()
+        if len(prefix) != PWNED_RANGE_PREFIX or not re.fullmatch(r"[0-9A-F]+", prefix):
+            raise ValueError(f"Prefix must be {PWNED_RANGE_PREFIX} hex characters")
+        # The 20-bit prefix is bracketed by the two 5-hex-digit boundaries below
+        start = bytes.fromhex(prefix + "0")[:3]
+        lo, hi = self._bucket(start[0] << 8 | start[1])
+        first = self._lower_bound(bytes([start[0], start[1], start[2] & 0xF0]), lo, hi)
+        last = self._lower_bound(bytes([start[0], start[1], (start[2] & 0xF0) + 0x10]), lo, hi) if start[2] < 0xF0 else hi
+        return [(self._key(i).hex().upper()[PWNED_RANGE_PREFIX:], self._count(i)) for i in range(first, last)]
+
+def md4_digest(data):
+    """Pure-Python MD4 (RFC 1320), for OpenSSL builds that no longer provide it"""
+    def rotate(x, n):
+        x &= 0xFFFFFFFF
+        return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+    
+    state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476]
+    message = data + b"\x80" + b"\0" * ((55 - len(data)) % 64) + struct.pack("<Q", len(data) * 8)
+    for offset in range(0, len(message), 64):
+        x = struct.unpack_from("<16I", message, offset)
+        a, b, c, d = state
+        for i in (0, 4, 8, 12):
+            a = rotate(a + ((b & c) | (~b & d)) + x[i], 3)
+            d = rotate(d + ((a & b) | (~a & c)) + x[i + 1], 7)
+            c = rotate(c + ((d & a) | (~d & b)) + x[i + 2], 11)
+            b = rotate(b + ((c & d) | (~c & a)) + x[i + 3], 19)
+        for i in (0, 1, 2, 3):
+            a = rotate(a + ((b & c) | (b & d) | (c & d)) + x[i] + 0x5A827999, 3)
+            d = rotate(d + ((a & b) | (a & c) | (b & c)) + x[i + 4] + 0x5A827999, 5)
+            c = rotate(c + ((d & a) | (d & b) | (a & b)) + x[i + 8] + 0x5A827999, 9)
+            b = rotate(b + ((c & d) | (c & a) | (d & a)) + x[i + 12] + 0x5A827999, 13)
+        for i in (0, 2, 1, 3):
+            a = rotate(a + (b ^ c ^ d) + x[i] + 0x6ED9EBA1, 3)
+            d = rotate(d + (a ^ b ^ c) + x[i + 8] + 0x6ED9EBA1, 9)
+            c = rotate(c + (d ^ a ^ b) + x[i + 4] + 0x6ED9EBA1, 11)
+            b = rotate(b + (c ^ d ^ a) + x[i + 12] + 0x6ED9EBA1, 15)
+        state = [(value + new) & 0xFFFFFFFF for value, new in zip(state, (a, b, c, d))]
+    return struct.pack("<4I", *state)
+
+def hash_password(password, hash_len):
+    """Hash a password the way the Pwned Passwords corpus does (SHA-1 or NTLM)"""
+    if hash_len == 20:
+        return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+    # NTLM is MD4 over UTF-16LE; MD4 is unavailable in OpenSSL 3 builds
+    data = password.encode("utf-16le")
+    try:
+        return hashlib.new("md4", data).hexdigest().upper()
+    except ValueError:
+        return md4_digest(data).hex().upper()
+
+def check_pwned_passwords(self, db_path, password_file):
+    """Check audit passwords against the offline Pwned Passwords index"""
+    print("\nChecking passwords against offline Pwned Passwords index...")
+    try:
+        index = PwnedPasswordsIndex(db_path)
+    except (OSError, ValueError) as e:
+        print(f"Error opening Pwned Passwords index: {e}")
+        return 0
+    
+    checked = 0
+    try:
+        with open(password_file, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                password = line.rstrip("\r\n")
+                if not password:
+                    continue
+                password_hash = hash_password(password, index.hash_len)
+                count = index.lookup(password_hash)
+                # Never store the password itself, only its range prefix
+                self.results["search_results"][f"Pwned Password Check (line {line_number})"] = {
+                    "url": f"https://api.pwnedpasswords.com/range/{password_hash[:PWNED_RANGE_PREFIX]}" + ("" if index.hash_len == 20 else "?mode=ntlm"),
+                    "category": "Data Breach Indicators",
+                    "info": f"Password on line {line_number} appears {count} times in breach corpus" if count else f"Password on line {line_number} not found in breach corpus"
+                }
+                print(f"✓ Checked password on line {line_number}: {'exposed' if count else 'not found'}")
+                checked += 1
+    except OSError as e:
+        print(f"Error reading password file: {e}")
+    finally:
+        index.close()
+    
+    return checked
+
+def serve_pwned_range_api(db_path, port):
+    """Serve GET /range/<prefix> from the offline index, mimicking the public range API"""
+    index = PwnedPasswordsIndex(db_path)
+    
+    class RangeHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = re.fullmatch(r"/range/([0-9A-Fa-f]{%d})" % PWNED_RANGE_PREFIX, urlparse(self.path).path)
+            if not match:
+                self.send_error(404)
+                return
+            body = "".join(f"{suffix}:{count}\r\n" for suffix, count in index.range(match.group(1))).encode("ascii")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+        def log_message(self, format, *args):
+            pass
+    
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), RangeHandler)
+    print(f"Serving Pwned Passwords range API on http://127.0.0.1:{port}/range/<prefix>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        index.close()
+
+class EntityGraph:
+    """Entity graph with nodes in lists and edges in parallel typed arrays"""
+    
+    EDGE_LABELS = ("identifies", "searched_via", "found_on")
+    
+    def __init__(self):
+        self.node_ids = {}
+        self.node_kinds = []
+        self.node_values = []
+        self.edge_src = array('I')
+        self.edge_dst = array('I')
+        self.edge_label = array('B')
+    
+    def add_node(self, kind, value):
+        """Return the node index for (kind, value), creating it if needed"""
+        key = (kind, value)
+        index = self.node_ids.get(key)
+        if index is None:
+            index = len(self.node_kinds)
+            self.node_ids[key] = index
+            self.node_kinds.append(kind)
+            self.node_values.append(value)
+        return index
+    
+    def add_edge(self, src, dst, label):
+        self.edge_src.append(src)
+        self.edge_dst.append(dst)
+        self.edge_label.append(self.EDGE_LABELS.index(label))
+    
+    def adjacency(self):
+        """Build compressed sparse row (offsets, targets) arrays of outgoing edges"""
+        offsets = array('I', [0] * (len(self.node_kinds) + 1))
+        for src in self.edge_src:
+            offsets[src + 1] += 1
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+        targets = array('I', [0] * len(self.edge_dst))
+        fill = array('I', offsets[:-1])
+        for src, dst in zip(self.edge_src, self.edge_dst):
+            targets[fill[src]] = dst
+            fill[src] += 1
+        return offsets, targets
+    
+    def to_json(self):
+        return {
+            "nodes": [{"id": i, "kind": kind, "value": value}
+                      for i, (kind, value) in enumerate(zip(self.node_kinds, self.node_values))],
+            "edges": [{"source": src, "target": dst, "label": self.EDGE_LABELS[label]}
+                      for src, dst, label in zip(self.edge_src, self.edge_dst, self.edge_label)]
+        }
+    
+    def to_graphml(self):
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+            '  <key id="kind" for="node" attr.name="kind" attr.type="string"/>',
+            '  <key id="value" for="node" attr.name="value" attr.type="string"/>',
+            '  <key id="label" for="edge" attr.name="label" attr.type="string"/>',
+            '  <graph id="osint" edgedefault="directed">'
+        ]
+        for i, (kind, value) in enumerate(zip(self.node_kinds, self.node_values)):
+            lines.append(f'    <node id="n{i}"><data key="kind">{escape(kind)}</data><data key="value">{escape(value)}</data></node>')
+        for i, (src, dst, label) in enumerate(zip(self.edge_src, self.edge_dst, self.edge_label)):
+            lines.append(f'    <edge id="e{i}" source="n{src}" target="n{dst}"><data key="label">{self.EDGE_LABELS[label]}</data></edge>')
+        lines.extend(['  </graph>', '</graphml>'])
+        return "\n".join(lines) + "\n"
+    
+    def export(self, path):
+        """Write the graph as GraphML or JSON depending on the file extension"""
+        with open(path, 'w') as f:
+            if path.lower().endswith(".graphml"):
+                f.write(self.to_graphml())
+            else:
+                json.dump(self.to_json(), f, indent=4)
+
+def extract_identifiers(text):
+    """Extract (kind, value) identifiers from the text of a fetched page"""
+    identifiers = set()
+    for email in EMAIL_PATTERN.findall(text):
+        email = email.lower()
+        identifiers.add(("email", email))
+        identifiers.add(("domain", email.split("@")[-1]))
+    for handle in HANDLE_PATTERN.findall(text):
+        identifiers.add(("username", handle.lower()))
+    return identifiers
+
+def is_incidental_identifier(kind, value, host):
+    """Whether an identifier belongs to the hosting site or a webmail provider rather than a person"""
+    host = (host or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    domain = value.split("@")[-1] if kind in ("email", "domain") else None
+    if domain is not None:
+        if kind == "domain" and domain in FREE_EMAIL_DOMAINS:
+            return True
+        # The site's own contact addresses, such as support@ on its pages
+        return bool(host) and (domain == host or host.endswith("." + domain) or domain.endswith("." + host))
+    # The site's own handle, such as @thatsthem on thatsthem.com
+    return bool(host) and value == host.split(".")[0]
+
+def fetch_page(self, url):
+    """Fetch a page, returning (status code, text); text is None unless the request succeeded"""
+    try:
+        response = http_get(url, headers=self.headers, timeout=10)
+    except requests.RequestException:
+        return None, None
+    return response.status_code, response.text if response.ok else None
+
+def simhash(text):
+    """64-bit SimHash over word shingles, robust to small edits such as ads or timestamps"""
+    words = WORD_PATTERN.findall(text.lower())
+    shingles = Counter(" ".join(words[i:i + SIMHASH_SHINGLE_SIZE])
+                       for i in range(max(len(words) - SIMHASH_SHINGLE_SIZE + 1, 1)))
+    if not words:
+        return 0
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles]
+    weights = list(shingles.values())
+    
+    if np is not None:
+        # Vote on every bit of every shingle hash at once
+        bits = (np.array(hashes, dtype=np.uint64)[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+        totals = (np.where(bits == 1, 1, -1) * np.array(weights)[:, None]).sum(axis=0)
+        return sum(1 << int(bit) for bit in np.nonzero(totals > 0)[0])
+    
+    totals = [0] * 64
+    for value, weight in zip(hashes, weights):
+        for bit in range(64):
+            totals[bit] += weight if value >> bit & 1 else -weight
+    return sum(1 << bit for bit in range(64) if totals[bit] > 0)
+
+def run_pivot_engine(self, max_depth=PIVOT_MAX_DEPTH, budget=PIVOT_BUDGET):
+    """Expand newly discovered identifiers breadth-first and record the entity graph"""
+    print("\nPivoting on discovered identifiers...")
+    subject_info = self.results["subject_info"]
+    search_methods = {
+        "email": self.search_by_email,
+        "username": self.search_by_username,
+        "domain": self.search_by_domain
+    }
+    
+    graph = EntityGraph()
+    subject = graph.add_node("subject", subject_info["name"])
+    
+    # Seed the frontier with the identifiers we started from
+    seeds = [("email", email.lower()) for email in subject_info.get("emails", [])]
+    seeds += [("domain", email.split("@")[-1].lower()) for email in subject_info.get("emails", [])
+              if "@" in email and email.split("@")[-1].lower() not in FREE_EMAIL_DOMAINS]
+    seeds += [("username", username.lower()) for username in subject_info.get("usernames", [])]
+    seen = set(seeds)
+    frontier = deque((kind, value, 0) for kind, value in seeds)
+    for kind, value in seeds:
+        graph.add_edge(subject, graph.add_node(kind, value), "identifies")
+    
+    fetched = 0
+    discovered = 0
+    fingerprints = {}
+    subject_identifiers = subject_identifier_terms(subject_info)
+    location_tokens = subject_location_tokens(subject_info)
+    while frontier and fetched < budget:
+        # Process the frontier one level at a time
+        level = []
+        depth = frontier[0][2]
+        while frontier and frontier[0][2] == depth:
+            level.append(frontier.popleft())
+        METRICS.set_gauge("osint_queue_depth", (("queue", "pivot_frontier"),), len(frontier))
+    
+        pages = []
+        for kind, value, _ in level:
+            before = set(self.results["search_results"])
+            # Seed identifiers were already searched by search_person
+            if depth > 0:
+                search_methods[kind](value)
+            identifier = graph.add_node(kind, value)
+            for search_name, data in self.results["search_results"].items():
+                if search_name in before and depth > 0:
+                    continue
+                if depth == 0 and f"({value})" not in search_name.lower():
+                    continue
+                graph.add_edge(identifier, graph.add_node("url", data["url"]), "searched_via")
+                pages.append(data["url"])
+    
+        if depth >= max_depth:
+            break
+    
+        pages = list(dict.fromkeys(pages))[:budget - fetched]
+        fetched += len(pages)
+        METRICS.set_gauge("osint_workers", (("pool", "pivot"),), PIVOT_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=PIVOT_MAX_WORKERS) as executor:
+            responses = list(executor.map(tracked_worker("pivot", self.fetch_page), pages))
+    
+        for url, (status, html) in zip(pages, responses):
+            fingerprints[url] = {"status": status}
+            if not html:
+                continue
+            text = BeautifulSoup(html, "html.parser").get_text(" ")
+            fingerprints[url]["simhash"] = format(simhash(text), "016x")
+            # Ranking features taken from the page text
+            lowered = text.lower()
+            fingerprints[url]["identifier_hits"] = sum(1 for identifier in subject_identifiers if identifier in lowered)
+            fingerprints[url]["location_hits"] = sum(1 for token in location_tokens if token in lowered)
+            # Only pages that mention the subject are trusted to lead to more of their identifiers
+            if not fingerprints[url]["identifier_hits"]:
+                continue
+            host = urlparse(url).hostname
+            for kind, value in extract_identifiers(text):
+                if is_incidental_identifier(kind, value, host):
+                    continue
+                graph.add_edge(graph.add_node(kind, value), graph.add_node("url", url), "found_on")
+                if (kind, value) not in seen:
+                    seen.add((kind, value))
+                    frontier.append((kind, value, depth + 1))
+                    METRICS.set_gauge("osint_queue_depth", (("queue", "pivot_frontier"),), len(frontier))
+                    discovered += 1
+                    print(f"✓ Discovered {kind}: {value}")
+    
+    # Keep status and content fingerprints on the results for change detection
+    for data in self.results["search_results"].values():
+        if data["url"] in fingerprints:
+            data.update(fingerprints[data["url"]])
+    
+    self.results["metadata"]["pivot"] = {
+        "pages_fetched": fetched,
+        "identifiers_discovered": discovered,
+        "graph_nodes": len(graph.node_kinds),
+        "graph_edges": len(graph.edge_src)
+    }
+    print(f"Fetched {fetched} pages, discovered {discovered} new identifiers")
+    return graph
+
+def find_previous_run(self):
+    """Return the most recent earlier .json or .osa output for this subject, or None"""
+    name = self.results["subject_info"]["name"]
+    directory = os.path.dirname(self.output_file or "") or "."
+    prefix = f"osint_{name.replace(' ', '_').lower()}_"
+    current = os.path.abspath(f"{self.output_file}.{self.results['metadata'].get('output_format', 'json')}")
+    
+    candidates = []
+    for path in glob.glob(os.path.join(glob.escape(directory), glob.escape(prefix) + "*")):
+        stem, extension = os.path.splitext(os.path.basename(path))
+        run_time = stem[len(prefix):]
+        if extension in (".json", ".osa") and run_time.isdigit() and os.path.abspath(path) != current:
+            candidates.append((int(run_time), path))
+    return max(candidates)[1] if candidates else None
+
+def load_run(path, name):
+    """Load one subject's results from a .json or .osa run file"""
+    if path.lower().endswith(".osa"):
+        with ArchiveReader(path) as reader:
+            position = reader.find(name)
+            return reader.read(position) if position is not None else None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def detect_changes(self, previous_path=None):
+    """Flag results that are new or whose status or content changed since the previous run"""
+    previous_path = previous_path or self.find_previous_run()
+    if not previous_path:
+        print("\nNo previous run found for change detection.")
+        return None
+    
+    print(f"\nComparing against previous run: {previous_path}")
+    try:
+        previous = load_run(previous_path, self.results["subject_info"]["name"])
+    except (OSError, ValueError) as e:
+        print(f"Error loading previous run: {e}")
+        return None
+    if previous is None:
+        print("Previous run does not contain this subject.")
+        return None
+    
+    previous_by_url = {data["url"]: data for data in previous["search_results"].values()}
+    current_urls = set()
+    changes = {"previous_run": previous_path, "new": [], "status_changed": [], "content_changed": [], "removed": []}
+    
+    for search_name, data in self.results["search_results"].items():
+        current_urls.add(data["url"])
+        old = previous_by_url.get(data["url"])
+        if old is None:
+            change = "new"
+        elif data.get("status") is not None and old.get("status") is not None and data["status"] != old["status"]:
+            change = "status_changed"
+        elif (data.get("simhash") and old.get("simhash")
+              and hamming_distance(int(data["simhash"], 16), int(old["simhash"], 16)) > SIMHASH_THRESHOLD):
+            change = "content_changed"
+        else:
+            continue
+        data["change"] = change
+        changes[change].append(search_name)
+    
+    changes["removed"] = [url for url in previous_by_url if url not in current_urls]
+    self.results["changes"] = changes
+    
+    print(f"✓ {len(changes['new'])} new, {len(changes['status_changed'])} status changed, "
+          f"{len(changes['content_changed'])} content changed, {len(changes['removed'])} removed")
+    return changes
+
+def subject_identifier_terms(subject_info):
+    """Lowercase identifiers whose presence on a page suggests it is about the subject"""
+    terms = [subject_info.get("name", "").lower()]
+    terms += [email.lower() for email in subject_info.get("emails", [])]
+    terms += [username.lower() for username in subject_info.get("usernames", [])]
+    terms += [re.sub(r'\D', '', phone) for phone in subject_info.get("phones", [])]
+    return [term for term in terms if len(term) >= 3]
+
+def subject_location_tokens(subject_info):
+    """Words from the birth place and addresses used to check location agreement"""
+    places = [subject_info.get("birth", {}).get("place", "")] + subject_info.get("addresses", [])
+    return sorted({word for place in places for word in WORD_PATTERN.findall(place.lower()) if len(word) >= 3 and not word.isdigit()})
+
+def rank_results(self):
+    """Score every result for relevance to the subject and reorder the results by score"""
+    entries = list(self.results["search_results"].items())
+    if not entries:
+        return []
+    subject_info = self.results["subject_info"]
+    name_tokens = sorted({word for word in WORD_PATTERN.findall(subject_info["name"].lower()) if len(word) >= 2})
+    location_tokens = subject_location_tokens(subject_info)
+    
+    features = []
+    name_counts = []
+    lengths = []
+    for search_name, data in entries:
+        words = WORD_PATTERN.findall(f"{search_name} {data['info']} {unquote_plus(data['url'])}".lower())
+        counts = Counter(words)
+        name_counts.append([counts[token] for token in name_tokens])
+        lengths.append(len(words) or 1)
+        location = sum(1 for token in location_tokens if counts[token]) / len(location_tokens) if location_tokens else 0.0
+        if data.get("location_hits"):
+            location = 1.0
+        features.append([
+            math.log1p(data.get("identifier_hits", 0)),
+            0.0,  # Name TF-IDF, filled in below
+            RANK_CATEGORY_PRIORS.get(data["category"], RANK_DEFAULT_PRIOR),
+            location,
+            1.0 if (data.get("status") or 0) >= 400 else 0.0
+        ])
+    
+    count = len(entries)
+    if np is not None:
+        # Score all results at once: TF-IDF of name tokens, then a weighted sum of features
+        matrix = np.array(features)
+        if name_tokens:
+            term_counts = np.array(name_counts, dtype=np.float64)
+            idf = np.log((1 + count) / (1 + (term_counts > 0).sum(axis=0))) + 1
+            matrix[:, 1] = (term_counts / np.array(lengths, dtype=np.float64)[:, None] * idf).sum(axis=1)
+        scores = (matrix @ np.array(RANK_WEIGHTS)).tolist()
+    else:
+        document_frequency = [sum(1 for row in name_counts if row[t]) for t in range(len(name_tokens))]
+        idf = [math.log((1 + count) / (1 + df)) + 1 for df in document_frequency]
+        scores = []
+        for row, counts, length in zip(features, name_counts, lengths):
+            row[1] = sum(c / length * w for c, w in zip(counts, idf))
+            scores.append(sum(value * weight for value, weight in zip(row, RANK_WEIGHTS)))
+    
+    # Stable sort keeps the original order among equal scores
+    order = sorted(range(count), key=lambda i: -scores[i])
+    self.results["search_results"] = {}
+    for i in order:
+        search_name, data = entries[i]
+        data["score"] = round(scores[i], 4)
+        self.results["search_results"][search_name] = data
+    return [entries[i][0] for i in order]
+
+def top_results(self, k):
+    """Return the k highest-scoring (name, data) pairs using a heap"""
+    items = self.results["search_results"].items()
+    return heapq.nlargest(k, items, key=lambda item: item[1].get("score", 0.0))
+
+def github_throttle(self, remaining, reset_at, limit=None):
+    """Record the remaining GitHub quota and pause so it lasts until the window resets"""
+    if remaining is None or reset_at is None:
+        return
+    self.github_rate_limit = {"remaining": remaining, "reset": reset_at, "limit": limit}
+    # The reserve scales with the quota (60/hour unauthenticated, 5000 with a token)
+    reserve = int(limit * GITHUB_RATE_LIMIT_RESERVE) if limit else 0
+    if remaining > reserve:
+        return
+    wait = max(reset_at - time.time(), 0)
+    delay = wait if remaining <= 0 else wait / remaining
+    if delay > 0:
+        print(f"GitHub rate limit low ({remaining} remaining), waiting {delay:.1f}s")
+        time.sleep(delay)
+
+def fetch_github_graphql(self, api_url, token, logins):
+    """Resolve a chunk of logins in one GraphQL request using aliased user() fields"""
+    variables = {f"l{i}": login for i, login in enumerate(logins)}
+    declarations = ", ".join(f"$l{i}: String!" for i in range(len(logins)))
+    fields = " ".join(f"u{i}: user(login: $l{i}) {{ {GITHUB_PROFILE_FIELDS} }}" for i in range(len(logins)))
+    query = f"query({declarations}) {{ {fields} rateLimit {{ limit remaining resetAt }} }}"
+    
+    response = http_request("POST", f"{api_url}/graphql", json={"query": query, "variables": variables},
+                            headers=dict(self.headers, Authorization=f"bearer {token}"), timeout=30)
+    response.raise_for_status()
+    data = response.json().get("data") or {}
+    
+    rate = data.get("rateLimit") or {}
+    reset_at = None
+    if rate.get("resetAt"):
+        reset_at = datetime.strptime(rate["resetAt"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    self.github_throttle(rate.get("remaining"), reset_at, rate.get("limit"))
+    
+    # Unknown logins come back as null with a NOT_FOUND error
+    profiles = {}
+    for i, login in enumerate(logins):
+        user = data.get(f"u{i}")
+        if user:
+            profiles[login] = {
+                "login": user["login"],
+                "name": user.get("name"),
+                "company": user.get("company"),
+                "location": user.get("location"),
+                "email": user.get("email") or None,
+                "blog": user.get("websiteUrl"),
+                "url": user["url"],
+                "organizations": [org["login"] for org in (user.get("organizations") or {}).get("nodes", [])]
+            }
+    return profiles
+
+def fetch_github_rest(self, url, etags):
+    """GET a GitHub REST resource with If-None-Match, reusing the cached body on 304"""
+    headers = dict(self.headers, Accept="application/vnd.github+json")
+    cached = etags.get(url)
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    
+    # Unauthenticated 304s still count against the quota, and carry the same headers
+    response = http_get(url, headers=headers, timeout=30)
+    rate = [response.headers.get(f"X-RateLimit-{field}") for field in ("Remaining", "Reset", "Limit")]
+    self.github_throttle(*(int(value) if value else None for value in rate))
+    
+    if response.status_code == 304 and cached:
+        METRICS.inc("osint_cache_requests_total", (("cache", "github_etag"), ("result", "hit")))
+        return cached["body"]
+    METRICS.inc("osint_cache_requests_total", (("cache", "github_etag"), ("result", "miss")))
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    body = response.json()
+    if response.headers.get("ETag"):
+        etags[url] = {"etag": response.headers["ETag"], "body": body}
+    return body
+
+def enrich_github_profiles(self, usernames):
+    """Look up GitHub profiles for usernames and add them to the results"""
+    print("\nEnriching GitHub profiles...")
+    api_url = self.results["metadata"].get("github_api", GITHUB_API_URL).rstrip("/")
+    token = self.github_token
+    logins = list(dict.fromkeys(username.lower() for username in usernames))
+    profiles = {}
+    
+    if token:
+        for start in range(0, len(logins), GITHUB_GRAPHQL_CHUNK):
+            chunk = logins[start:start + GITHUB_GRAPHQL_CHUNK]
+            try:
+                profiles.update(self.fetch_github_graphql(api_url, token, chunk))
+            except (requests.RequestException, ValueError) as e:
+                print(f"Error querying GitHub GraphQL API: {e}")
+    else:
+        # The GraphQL API requires a token; fall back to unauthenticated conditional REST requests
+        etags = {}
+        if os.path.exists(GITHUB_ETAG_CACHE):
+            try:
+                with open(GITHUB_ETAG_CACHE, 'r') as f:
+                    etags = json.load(f)
+            except (OSError, ValueError):
+                pass
+        for login in logins:
+            try:
+                user = self.fetch_github_rest(f"{api_url}/users/{quote_plus(login)}", etags)
+                if user is None:
+                    continue
+                orgs = self.fetch_github_rest(f"{api_url}/users/{quote_plus(login)}/orgs", etags) or []
+            except (requests.RequestException, ValueError) as e:
+                print(f"Error querying GitHub REST API for {login}: {e}")
+                continue
+            profiles[login] = {
+                "login": user["login"],
+                "name": user.get("name"),
+                "company": user.get("company"),
+                "location": user.get("location"),
+                "email": user.get("email"),
+                "blog": user.get("blog") or None,
+                "url": user["html_url"],
+                "organizations": [org["login"] for org in orgs]
+            }
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(GITHUB_ETAG_CACHE, 'w') as f:
+                json.dump(etags, f)
+        except OSError as e:
+            print(f"Error caching GitHub ETags: {e}")
+    
+    for login, profile in profiles.items():
+        details = [f"{label}: {profile[key]}" for label, key in
+                   (("Name", "name"), ("Company", "company"), ("Location", "location"), ("Email", "email"), ("Blog", "blog"))
+                   if profile.get(key)]
+        if profile["organizations"]:
+            details.append(f"Organizations: {', '.join(profile['organizations'])}")
+        self.results["search_results"][f"GitHub Profile ({login})"] = {
+            "url": profile["url"],
+            "category": "Username",
+            "info": f"GitHub profile for {profile['login']}" + (f" ({'; '.join(details)})" if details else ""),
+            "profile": profile
+        }
+        print(f"✓ Enriched GitHub profile: {profile['login']}")
+    
+    print(f"Resolved {len(profiles)} of {len(logins)} GitHub usernames")
+    return profiles
+
+def normalize_name_part(part):
+    """Lowercase ASCII letters and digits only, with accents removed"""
+    ascii_part = unicodedata.normalize("NFKD", part).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]", "", ascii_part.lower())
+
+def generate_email_candidates(name, domains):
+    """Build likely addresses for a name at each domain, without duplicates"""
+    parts = [normalize_name_part(part) for part in name.split()]
+    parts = [part for part in parts if part]
+    if not parts:
+        return []
+    first, last = parts[0], parts[-1]
+    # A single name would only repeat itself in the two-part patterns
+    patterns = EMAIL_PATTERNS if len(parts) > 1 else ("{first}",)
+    candidates = []
+    for domain in domains:
+        for pattern in patterns:
+            local = pattern.format(first=first, last=last, f=first[0], l=last[0])
+            candidates.append(f"{local}@{domain.lower()}")
+    return list(dict.fromkeys(candidates))
+
+def resolve_mail_host(domain):
+    """Return the preferred MX host for a domain, or the domain itself if there is no MX record"""
+    if dns is None:
+        return domain
+    try:
+        answers = dns.resolver.resolve(domain, "MX")
+    except Exception:
+        # RFC 5321: without an MX record the domain itself is the mail host
+        return domain
+    best = min(answers, key=lambda answer: answer.preference)
+    return str(best.exchange).rstrip(".") or domain
+
+class SMTPPool:
+    """Persistent SMTP connections pooled per mail server, with bounded concurrency per host"""
+    
+    def __init__(self, port=SMTP_PORT, helo=None, sender="", max_per_host=SMTP_MAX_PER_HOST):
+        self.port = port
+        self.helo = helo or socket.getfqdn()
+        self.sender = sender
+        self.max_per_host = max_per_host
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.slots = {}
+    
+    def _slot(self, host):
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                self.idle[host] = []
+            return self.slots[host]
+    
+    def _connect(self, host):
+        connection = smtplib.SMTP(host, self.port, timeout=SMTP_TIMEOUT)
+        connection.ehlo(self.helo)
+        code, message = connection.mail(self.sender)
+        if code >= 400:
+            connection.close()
+            raise smtplib.SMTPSenderRefused(code, message, self.sender)
+        return connection
+    
+    def check(self, host, address):
+        """RCPT TO one address over a pooled connection, returning the SMTP reply code"""
+        with self._slot(host):
+            with self.lock:
+                connection = self.idle[host].pop() if self.idle[host] else None
+            for attempt in range(2):
+                try:
+                    if connection is None:
+                        connection = self._connect(host)
+                    code, _ = connection.rcpt(address)
+                    with self.lock:
+                        self.idle[host].append(connection)
+                    return code
+                except (smtplib.SMTPException, OSError):
+                    # Stale pooled connection; reconnect once
+                    if connection is not None:
+                        try:
+                            connection.close()
+                        except Exception:
+                            pass
+                    connection = None
+                    if attempt:
+                        raise
+    
+    def close(self):
+        with self.lock:
+            connections = [connection for idle in self.idle.values() for connection in idle]
+            self.idle = {host: [] for host in self.idle}
+        for connection in connections:
+            try:
+                connection.quit()
+            except Exception:
+                pass
+
+def verify_email_candidates(self):
+    """Generate likely addresses for the subject and check them against the domains' mail servers"""
+    print("\nGenerating and verifying email address candidates...")
+    metadata = self.results["metadata"]
+    subject_info = self.results["subject_info"]
+    
+    # Candidate domains: explicit employer domains, non-free email domains, guessed employer domains
+    domains = list(metadata.get("employer_domains") or [])
+    domains += [email.split("@")[-1].lower() for email in subject_info.get("emails", []) if "@" in email]
+    domains += [f"{normalize_name_part(employer)}.com" for employer in subject_info.get("employers", []) if normalize_name_part(employer)]
+    domains = [domain.strip().lower() for domain in domains]
+    domains = [domain for domain in dict.fromkeys(domains) if domain and domain not in FREE_EMAIL_DOMAINS]
+    candidates = [address for address in generate_email_candidates(subject_info["name"], domains)
+                  if address not in [email.lower() for email in subject_info.get("emails", [])]]
+    if not candidates:
+        print("No candidate addresses to verify.")
+        return {}
+    
+    mail_hosts = {domain: metadata.get("smtp_host") or resolve_mail_host(domain) for domain in domains}
+    pool = SMTPPool(port=metadata.get("smtp_port", SMTP_PORT), helo=metadata.get("smtp_helo"), sender=metadata.get("smtp_from", ""))
+    
+    def check(address):
+        try:
+            return pool.check(mail_hosts[address.split("@")[-1]], address)
+        except (smtplib.SMTPException, OSError) as e:
+            return str(e) or type(e).__name__
+    
+    statuses = {}
+    METRICS.set_gauge("osint_workers", (("pool", "smtp"),), SMTP_MAX_WORKERS)
+    try:
+        with ThreadPoolExecutor(max_workers=SMTP_MAX_WORKERS) as executor:
+            # A random mailbox that is accepted means the domain accepts everything
+            probes = [f"{secrets.token_hex(8)}@{domain}" for domain in domains]
+            catch_all = {domain: code in (250, 251)
+                         for domain, code in zip(domains, executor.map(tracked_worker("smtp", check), probes))}
+            codes = executor.map(tracked_worker("smtp", check), candidates)
+            for address, code in zip(candidates, codes):
+                domain = address.split("@")[-1]
+                if not isinstance(code, int):
+                    statuses[address] = "unknown"
+                elif code in (250, 251):
+                    statuses[address] = "catch-all" if catch_all[domain] else "valid"
+                elif code >= 500:
+                    statuses[address] = "invalid"
+                else:
+                    statuses[address] = "unknown"
+    finally:
+        pool.close()
+    
+    for address, status in statuses.items():
+        if status not in ("valid", "catch-all"):
+            continue
+        info = (f"Mail server accepted {address}" if status == "valid"
+                else f"Possible address {address} (domain accepts all recipients, cannot be confirmed)")
+        self.results["search_results"][f"Email Candidate ({address})"] = {
+            "url": f"mailto:{address}",
+            "category": "Email",
+            "info": info,
+            "verification": status
+        }
+        if status == "valid":
+            print(f"✓ Mail server accepted: {address}")
+    
+    counts = Counter(statuses.values())
+    metadata["email_verification"] = dict(counts, candidates=len(candidates))
+    print(f"Checked {len(candidates)} candidates: {counts['valid']} valid, {counts['catch-all']} catch-all, "
+          f"{counts['invalid']} invalid, {counts['unknown']} unknown")
+    return statuses
+
+def tokenize_dork(query):
+    """Split a Google query into terms, keeping quoted phrases and groups intact"""
+    return DORK_TOKEN_PATTERN.findall(query)
+
+def count_query_terms(query):
+    """Words in a query as the engine counts them, including those inside phrases and groups"""
+    return len(re.sub(r'[()"]', " ", query).split())
+
+def _mergeable_token(tokens, i):
+    """Whether tokens[i] can become one alternative of an OR-group
+    
+    Only single tokens are merged: quoting several words to make one alternative
+    would turn them into an exact phrase and match fewer pages.
+    """
+    if tokens[i] == "OR":
+        return False
+    # Merging next to an existing OR would change what that OR binds to
+    return not ((i > 0 and tokens[i - 1] == "OR") or (i + 1 < len(tokens) and tokens[i + 1] == "OR"))
+
+def compile_dork_queries(queries):
+    """Merge queries that differ in one token into OR-groups under the engine's limits
+    
+    Returns a list of (member_indices, query) covering every input query.
+    """
+    remaining = {index: tokenize_dork(query) for index, query in enumerate(queries)}
+    compiled = []
+    
+    while True:
+        # Bucket queries by shared prefix/suffix around each candidate token
+        buckets = {}
+        for index, tokens in remaining.items():
+            for i in range(len(tokens)):
+                if _mergeable_token(tokens, i):
+                    key = (tuple(tokens[:i]), tuple(tokens[i + 1:]))
+                    buckets.setdefault(key, {})[index] = tokens[i]
+    
+        if not buckets:
+            break
+        (prefix, suffix), members = max(buckets.items(), key=lambda item: (len(item[1]), -min(item[1])))
+        if len(members) < 2:
+            break
+    
+        # Pack alternatives into as few queries as the limits allow
+        group, alternatives = [], []
+        for index, token in sorted(members.items()):
+            candidate = alternatives + ([token] if token not in alternatives else [])
+            query = " ".join(list(prefix) + ["(" + " OR ".join(candidate) + ")"] + list(suffix))
+            if group and (count_query_terms(query) > GOOGLE_MAX_QUERY_TERMS or len(GOOGLE_SEARCH_URL + quote_plus(query)) > GOOGLE_MAX_URL_LENGTH):
+                compiled.append((group, _join_group(prefix, alternatives, suffix)))
+                group, alternatives = [], []
+            group.append(index)
+            if token not in alternatives:
+                alternatives.append(token)
+            del remaining[index]
+        compiled.append((group, _join_group(prefix, alternatives, suffix)))
+    
+    for index, tokens in remaining.items():
+        compiled.append(([index], " ".join(tokens)))
+    return sorted(compiled, key=lambda item: min(item[0]))
+
+def _join_group(prefix, alternatives, suffix):
+    middle = alternatives[0] if len(alternatives) == 1 else "(" + " OR ".join(alternatives) + ")"
+    return " ".join(list(prefix) + [middle] + list(suffix))
+
+def compile_dorks(self):
+    """Replace near-identical Google dorks in the results with merged OR-queries"""
+    print("\nCompiling Google dork queries...")
+    total_before = 0
+    total_after = 0
+    
+    for category in DORK_CATEGORIES:
+        names = [name for name, data in self.results["search_results"].items()
+                 if data["category"] == category and data["url"].startswith(GOOGLE_SEARCH_URL)]
+        if not names:
+            continue
+        queries = [parse_qs(urlparse(self.results["search_results"][name]["url"]).query)["q"][0] for name in names]
+        compiled = compile_dork_queries(queries)
+        total_before += len(names)
+        total_after += len(compiled)
+    
+        for members, query in compiled:
+            if len(members) == 1:
+                continue
+            merged_names = [names[index] for index in members]
+            for name in merged_names:
+                del self.results["search_results"][name]
+            combined_name = f"Combined: {merged_names[0]} (+{len(merged_names) - 1} more)"
+            self.results["search_results"][combined_name] = {
+                "url": GOOGLE_SEARCH_URL + quote_plus(query),
+                "category": category,
+                "info": f"Combined search covering: {', '.join(merged_names)}",
+                "merged_from": merged_names
+            }
+            print(f"✓ Combined {len(merged_names)} queries: {combined_name}")
+    
+    saved = total_before - total_after
+    self.results["metadata"]["dork_compiler"] = {
+        "queries_before": total_before,
+        "queries_after": total_after,
+        "queries_saved": saved
+    }
+    print(f"Compiled {total_before} queries into {total_after} ({saved} saved)")
+    return saved
+
+class QueueBackend:
+    """Interface for work queue backends that lease subject chunks to workers"""
+    
+    def enqueue(self, chunks):
+        """Add chunks (lists of subject_info dicts) as pending work"""
+        raise NotImplementedError
+    
+    def lease(self, worker_id, lease_seconds):
+        """Lease one pending chunk, returning (chunk_id, subjects) or None"""
+        raise NotImplementedError
+    
+    def renew(self, chunk_id, worker_id, lease_seconds):
+        """Extend a lease, returning False if the worker no longer holds it"""
+        raise NotImplementedError
+    
+    def complete(self, chunk_id, worker_id, results):
+        """Store results for a leased chunk, returning False if the lease was lost"""
+        raise NotImplementedError
+    
+    def counts(self):
+        """Return the number of pending, leased and done chunks"""
+        raise NotImplementedError
+    
+    def iter_results(self):
+        """Yield every stored result"""
+        raise NotImplementedError
+
+class MemoryQueueBackend(QueueBackend):
+    """In-process queue backend, a stand-in for SQLite or Redis when testing workers"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.chunks = {}
+        self.pending = deque()
+        self.leases = {}
+        self.done = 0
+        self.results = []
+    
+    def _requeue_expired(self, now):
+        for chunk_id, (_, expires) in list(self.leases.items()):
+            if expires < now:
+                del self.leases[chunk_id]
+                self.pending.append(chunk_id)
+    
+    def enqueue(self, chunks):
+        with self.lock:
+            for subjects in chunks:
+                chunk_id = len(self.chunks) + 1
+                self.chunks[chunk_id] = subjects
+                self.pending.append(chunk_id)
+    
+    def lease(self, worker_id, lease_seconds):
+        with self.lock:
+            now = time.time()
+            self._requeue_expired(now)
+            if not self.pending:
+                return None
+            chunk_id = self.pending.popleft()
+            self.leases[chunk_id] = (worker_id, now + lease_seconds)
+            return chunk_id, self.chunks[chunk_id]
+    
+    def renew(self, chunk_id, worker_id, lease_seconds):
+        with self.lock:
+            if self.leases.get(chunk_id, (None,))[0] != worker_id:
+                return False
+            self.leases[chunk_id] = (worker_id, time.time() + lease_seconds)
+            return True
+    
+    def complete(self, chunk_id, worker_id, results):
+        with self.lock:
+            if self.leases.get(chunk_id, (None,))[0] != worker_id:
+                return False
+            del self.leases[chunk_id]
+            self.done += 1
+            self.results.extend(results)
+            return True
+    
+    def counts(self):
+        with self.lock:
+            self._requeue_expired(time.time())
+            return {"pending": len(self.pending), "leased": len(self.leases), "done": self.done}
+    
+    def iter_results(self):
+        with self.lock:
+            results = list(self.results)
+        return iter(results)
+
+class SQLiteQueueBackend(QueueBackend):
+    """Queue backend in a SQLite file shared by the coordinator and workers"""
+    
+    def __init__(self, path):
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS chunks (id INTEGER PRIMARY KEY, subjects TEXT NOT NULL, "
+                        "state TEXT NOT NULL DEFAULT 'pending', owner TEXT, expires REAL, attempts INTEGER NOT NULL DEFAULT 0)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS chunks_state ON chunks (state, expires)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY, chunk_id INTEGER NOT NULL, "
+                        "subject TEXT, worker TEXT, completed REAL, results TEXT NOT NULL)")
+    
+    def _requeue_expired(self, now):
+        self.db.execute("UPDATE chunks SET state = 'pending', owner = NULL, expires = NULL "
+                        "WHERE state = 'leased' AND expires < ?", (now,))
+    
+    def enqueue(self, chunks):
+        self.db.execute("BEGIN IMMEDIATE")
+        self.db.executemany("INSERT INTO chunks (subjects) VALUES (?)", ((json.dumps(subjects),) for subjects in chunks))
+        self.db.execute("COMMIT")
+    
+    def lease(self, worker_id, lease_seconds):
+        now = time.time()
+        # BEGIN IMMEDIATE serialises leasing across workers without holding the lock while searching
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self._requeue_expired(now)
+            row = self.db.execute("SELECT id, subjects FROM chunks WHERE state = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is not None:
+                self.db.execute("UPDATE chunks SET state = 'leased', owner = ?, expires = ?, attempts = attempts + 1 WHERE id = ?",
+                                (worker_id, now + lease_seconds, row[0]))
+            self.db.execute("COMMIT")
+        except sqlite3.Error:
+            self.db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+    
+    def renew(self, chunk_id, worker_id, lease_seconds):
+        cursor = self.db.execute("UPDATE chunks SET expires = ? WHERE id = ? AND state = 'leased' AND owner = ?",
+                                 (time.time() + lease_seconds, chunk_id, worker_id))
+        return cursor.rowcount == 1
+    
+    def complete(self, chunk_id, worker_id, results):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.db.execute("UPDATE chunks SET state = 'done', expires = NULL WHERE id = ? AND state = 'leased' AND owner = ?",
+                                     (chunk_id, worker_id))
+            if cursor.rowcount == 1:
+                now = time.time()
+                self.db.executemany("INSERT INTO results (chunk_id, subject, worker, completed, results) VALUES (?, ?, ?, ?, ?)",
+                                    ((chunk_id, result["subject_info"].get("name"), worker_id, now, json.dumps(result)) for result in results))
+            self.db.execute("COMMIT")
+        except sqlite3.Error:
+            self.db.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+    
+    def counts(self):
+        counts = {"pending": 0, "leased": 0, "done": 0}
+        now = time.time()
+        for state, expired, count in self.db.execute(
+                "SELECT state, state = 'leased' AND expires < ?, COUNT(*) FROM chunks GROUP BY 1, 2", (now,)):
+            # Expired leases count as pending since the next lease call re-queues them
+            counts["pending" if expired else state] += count
+        return counts
+    
+    def iter_results(self):
+        for (results,) in self.db.execute("SELECT results FROM results ORDER BY id"):
+            yield json.loads(results)
+
+class RedisQueueBackend(QueueBackend):
+    """Queue backend on any Redis-compatible server, using Lua scripts for atomic leases"""
+    
+    LEASE_SCRIPT = """
+        local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+        for _, id in ipairs(expired) do
+            redis.call('ZREM', KEYS[2], id)
+            redis.call('HDEL', KEYS[3], id)
+            redis.call('LPUSH', KEYS[1], id)
+        end
+        local id = redis.call('RPOP', KEYS[1])
+        if not id then return false end
+        redis.call('ZADD', KEYS[2], ARGV[2], id)
+        redis.call('HSET', KEYS[3], id, ARGV[3])
+        return id
+    """
+    RENEW_SCRIPT = """
+        if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+        redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+        return 1
+    """
+    COMPLETE_SCRIPT = """
+        if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+        redis.call('ZREM', KEYS[1], ARGV[1])
+        redis.call('HDEL', KEYS[2], ARGV[1])
+        redis.call('HDEL', KEYS[3], ARGV[1])
+        for i = 3, #ARGV do redis.call('RPUSH', KEYS[4], ARGV[i]) end
+        redis.call('INCR', KEYS[5])
+        return 1
+    """
+    
+    def __init__(self, url, prefix="osint"):
+        self.client = redis.Redis.from_url(url)
+        self.keys = {name: f"{prefix}:{name}" for name in ("pending", "leased", "owners", "chunks", "results", "done", "next_id")}
+        self.lease_script = self.client.register_script(self.LEASE_SCRIPT)
+        self.renew_script = self.client.register_script(self.RENEW_SCRIPT)
+        self.complete_script = self.client.register_script(self.COMPLETE_SCRIPT)
+    
+    def enqueue(self, chunks):
+        for subjects in chunks:
+            chunk_id = self.client.incr(self.keys["next_id"])
+            pipeline = self.client.pipeline()
+            pipeline.hset(self.keys["chunks"], chunk_id, json.dumps(subjects))
+            pipeline.lpush(self.keys["pending"], chunk_id)
+            pipeline.execute()
+    
+    def lease(self, worker_id, lease_seconds):
+        now = time.time()
+        chunk_id = self.lease_script(keys=[self.keys["pending"], self.keys["leased"], self.keys["owners"]],
+                                     args=[now, now + lease_seconds, worker_id])
+        if not chunk_id:
+            return None
+        subjects = self.client.hget(self.keys["chunks"], chunk_id)
+        return int(chunk_id), json.loads(subjects)
+    
+    def renew(self, chunk_id, worker_id, lease_seconds):
+        return bool(self.renew_script(keys=[self.keys["leased"], self.keys["owners"]],
+                                      args=[chunk_id, worker_id, time.time() + lease_seconds]))
+    
+    def complete(self, chunk_id, worker_id, results):
+        return bool(self.complete_script(
+            keys=[self.keys["leased"], self.keys["owners"], self.keys["chunks"], self.keys["results"], self.keys["done"]],
+            args=[chunk_id, worker_id] + [json.dumps(result) for result in results]))
+    
+    def counts(self):
+        now = time.time()
+        expired = self.client.zcount(self.keys["leased"], "-inf", now)
+        return {
+            "pending": self.client.llen(self.keys["pending"]) + expired,
+            "leased": self.client.zcard(self.keys["leased"]) - expired,
+            "done": int(self.client.get(self.keys["done"]) or 0)
+        }
+    
+    def iter_results(self):
+        length = self.client.llen(self.keys["results"])
+        for start in range(0, length, 500):
+            for result in self.client.lrange(self.keys["results"], start, start + 499):
+                yield json.loads(result)
+
+def open_queue_backend(url):
+    """Open a queue backend from redis://..., sqlite:///path or a plain file path"""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        if redis is None:
+            raise ValueError("the redis package is required for Redis queues")
+        return RedisQueueBackend(url)
+    if url == "memory://":
+        return MemoryQueueBackend()
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SQLiteQueueBackend(url)
+
+def enqueue_watchlist(backend, watchlist_path, chunk_size=QUEUE_CHUNK_SIZE):
+    """Split a JSON-lines watchlist of subject_info dicts into chunks and enqueue them"""
+    chunks = []
+    chunk = []
+    with open(watchlist_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            subject_info = json.loads(line)
+            if not subject_info.get("name"):
+                print(f"Skipping watchlist entry without a name: {line}")
+                continue
+            chunk.append(subject_info)
+            if len(chunk) >= chunk_size:
+                chunks.append(chunk)
+                chunk = []
+    if chunk:
+        chunks.append(chunk)
+    backend.enqueue(chunks)
+    print(f"✓ Enqueued {sum(len(chunk) for chunk in chunks)} subjects in {len(chunks)} chunks")
+    return len(chunks)
+
+def run_queue_worker(backend, options, lease_seconds=QUEUE_LEASE_SECONDS, worker_id=None, github_token=None):
+    """Lease chunks and search each subject until the queue is drained"""
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    print(f"\nWorker {worker_id} started")
+    processed = 0
+    
+    while True:
+        lease = backend.lease(worker_id, lease_seconds)
+        if lease is None:
+            counts = backend.counts()
+            METRICS.set_gauge("osint_queue_depth", (("queue", "pending_chunks"),), counts["pending"])
+            if not counts["pending"] and not counts["leased"]:
+                break
+            # Other workers still hold leases that may expire and be re-queued
+            time.sleep(QUEUE_POLL_INTERVAL)
+            continue
+    
+        chunk_id, subjects = lease
+        print(f"\nLeased chunk {chunk_id} ({len(subjects)} subjects)")
+        results = []
+        for subject_info in subjects:
+            searcher = EnhancedOSINTSearcher()
+            searcher.results["subject_info"] = subject_info
+            searcher.results["metadata"].update(options)
+            searcher.results["metadata"]["open_browser"] = False
+            searcher.results["metadata"]["save_output"] = False
+            if github_token:
+                searcher.github_token = github_token
+            searcher.search_person()
+            results.append(searcher.results)
+            if not backend.renew(chunk_id, worker_id, lease_seconds):
+                print(f"Lost lease on chunk {chunk_id}, leaving it to another worker")
+                break
+        else:
+            if backend.complete(chunk_id, worker_id, results):
+                processed += len(results)
+                print(f"✓ Completed chunk {chunk_id}")
+            else:
+                print(f"Lost lease on chunk {chunk_id}, results discarded")
+    
+    print(f"Worker {worker_id} finished after {processed} subjects")
+    return processed
+
+def export_queue_results(backend, output_path):
+    """Write every stored result to a JSON-lines file, or an archive for .osa paths"""
+    count = 0
+    if output_path.lower().endswith(".osa"):
+        with ArchiveWriter(output_path) as writer:
+            for result in backend.iter_results():
+                writer.add(result)
+                count += 1
+    else:
+        with open(output_path, 'w') as f:
+            for result in backend.iter_results():
+                f.write(json.dumps(result) + "\n")
+                count += 1
+    print(f"✓ Exported {count} results to {output_path}")
+    return count
+
+def _pack_uint32(values):
+    """Encode an integer column as big-endian uint32"""
+    return struct.pack(f">{len(values)}I", *values)
+
+def _unpack_uint32(data, offset, count, byte_order=">"):
+    """Decode an integer column, returning (values, new offset)"""
+    return struct.unpack_from(f"{byte_order}{count}I", data, offset), offset + 4 * count
+
+def _pack_strings(values):
+    """Encode a string column as uint32 lengths followed by the UTF-8 data"""
+    encoded = [value.encode("utf-8") for value in values]
+    return _pack_uint32([len(value) for value in encoded]) + b"".join(encoded)
+
+def _unpack_strings(data, offset, count, byte_order=">"):
+    """Decode a string column written by _pack_strings, returning (values, new offset)"""
+    lengths, offset = _unpack_uint32(data, offset, count, byte_order)
+    values = []
+    for length in lengths:
+        values.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    return values, offset
+
+class ArchiveWriter:
+    """Write run results to a columnar, compressed archive with an index footer"""
+    
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION]))
+        self.prefixes = {}
+        self.categories = {}
+        self.index = []
+        self.dictionary = None
+        self.dictionary_offset = None
+        self.dictionary_length = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _intern(self, table, value):
+        index = table.get(value)
+        if index is None:
+            index = table[value] = len(table)
+        return index
+    
+    def add(self, results):
+        """Append one subject's results as a compressed block"""
+        name = results["subject_info"].get("name", "")
+        encoded_name = quote_plus(name)
+        entries = list(results["search_results"].items())
+        header = {key: value for key, value in results.items() if key != "search_results"}
+    
+        # Name substitution is skipped if the token could be confused with real data
+        substitute = bool(name) and not any(ARCHIVE_NAME_TOKEN in text for search_name, data in entries
+                                            for text in (search_name, data["url"], data["info"]))
+        header["name_substituted"] = substitute
+    
+        def shrink(text, value):
+            return text.replace(value, ARCHIVE_NAME_TOKEN) if substitute else text
+    
+        search_names, prefix_ids, url_rests, category_ids, infos, extras = [], [], [], [], [], []
+        for search_name, data in entries:
+            url = data["url"]
+            match = ARCHIVE_PREFIX_PATTERN.match(url)
+            prefix = match.group(0) if match else ""
+            search_names.append(shrink(search_name, name))
+            prefix_ids.append(self._intern(self.prefixes, prefix))
+            url_rests.append(shrink(url[len(prefix):], encoded_name))
+            category_ids.append(self._intern(self.categories, data["category"]))
+            infos.append(shrink(data["info"], name))
+            extra = {key: value for key, value in data.items() if key not in ("url", "category", "info")}
+            extras.append(json.dumps(extra) if extra else "")
+    
+        header_bytes = json.dumps(header).encode("utf-8")
+        block = b"".join([
+            struct.pack(">II", len(header_bytes), len(entries)),
+            header_bytes,
+            _pack_strings(search_names),
+            _pack_uint32(prefix_ids),
+            _pack_strings(url_rests),
+            _pack_uint32(category_ids),
+            _pack_strings(infos),
+            _pack_strings(extras)
+        ])
+        # Blocks are compressed separately for random access, so a preset dictionary
+        # taken from the first block lets later blocks reuse its repeated strings
+        if self.dictionary is None:
+            self.dictionary = block[-ARCHIVE_DICTIONARY_SIZE:]
+            compressed_dictionary = zlib.compress(self.dictionary, ARCHIVE_COMPRESSION_LEVEL)
+            self.dictionary_offset = self.file.tell()
+            self.dictionary_length = len(compressed_dictionary)
+            self.file.write(compressed_dictionary)
+        
+        compressor = zlib.compressobj(ARCHIVE_COMPRESSION_LEVEL, zdict=self.dictionary)
+        compressed = compressor.compress(block) + compressor.flush()
+        self.index.append((name, self.file.tell(), len(compressed)))
+        self.file.write(compressed)
+    
+    def close(self):
+        if self.file.closed:
+            return
+        footer = zlib.compress(json.dumps({
+            "prefixes": list(self.prefixes),
+            "categories": list(self.categories),
+            "dictionary": [self.dictionary_offset, self.dictionary_length] if self.dictionary is not None else None,
+            "index": self.index
+        }).encode("utf-8"), ARCHIVE_COMPRESSION_LEVEL)
+        offset = self.file.tell()
+        self.file.write(footer)
+        self.file.write(ARCHIVE_TRAILER.pack(offset, len(footer), ARCHIVE_MAGIC))
+        self.file.close()
+
+class ArchiveReader:
+    """Random access to subjects stored by ArchiveWriter"""
+    
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        start = self.file.read(len(ARCHIVE_MAGIC) + 1)
+        if start[:-1] != ARCHIVE_MAGIC or start[-1:] not in (b"\x01", bytes([ARCHIVE_VERSION])):
+            self.file.close()
+            raise ValueError(f"{path} is not an OSINT archive")
+        # Version 1 wrote columns in the writer's native (in practice little-endian) order
+        self.byte_order = "<" if start[-1] == 1 else ">"
+        self.file.seek(-ARCHIVE_TRAILER.size, os.SEEK_END)
+        offset, length, magic = ARCHIVE_TRAILER.unpack(self.file.read(ARCHIVE_TRAILER.size))
+        if magic != ARCHIVE_MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+        self.file.seek(offset)
+        footer = json.loads(zlib.decompress(self.file.read(length)))
+        self.prefixes = footer["prefixes"]
+        self.categories = footer["categories"]
+        self.index = footer["index"]
+        self.dictionary = b""
+        if footer["dictionary"]:
+            self.file.seek(footer["dictionary"][0])
+            self.dictionary = zlib.decompress(self.file.read(footer["dictionary"][1]))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def __iter__(self):
+        for position in range(len(self.index)):
+            yield self.read(position)
+    
+    def close(self):
+        self.file.close()
+    
+    def subjects(self):
+        return [name for name, _, _ in self.index]
+    
+    def find(self, name):
+        """Position of the first subject with this name, or None"""
+        for position, (subject, _, _) in enumerate(self.index):
+            if subject == name:
+                return position
+        return None
+    
+    def read(self, position):
+        """Decode the results of the subject at an index position"""
+        name, offset, length = self.index[position]
+        self.file.seek(offset)
+        decompressor = zlib.decompressobj(zdict=self.dictionary)
+        block = decompressor.decompress(self.file.read(length)) + decompressor.flush()
+    
+        header_length, count = struct.unpack_from(">II", block, 0)
+        offset = 8
+        results = json.loads(block[offset:offset + header_length])
+        offset += header_length
+        substitute = results.pop("name_substituted")
+        encoded_name = quote_plus(name)
+    
+        def expand(text, value):
+            return text.replace(ARCHIVE_NAME_TOKEN, value) if substitute else text
+    
+        byte_order = self.byte_order
+        search_names, offset = _unpack_strings(block, offset, count, byte_order)
+        prefix_ids, offset = _unpack_uint32(block, offset, count, byte_order)
+        url_rests, offset = _unpack_strings(block, offset, count, byte_order)
+        category_ids, offset = _unpack_uint32(block, offset, count, byte_order)
+        infos, offset = _unpack_strings(block, offset, count, byte_order)
+        extras, offset = _unpack_strings(block, offset, count, byte_order)
+    
+        search_results = {}
+        for i in range(count):
+            data = {
+                "url": self.prefixes[prefix_ids[i]] + expand(url_rests[i], encoded_name),
+                "category": self.categories[category_ids[i]],
+                "info": expand(infos[i], name)
+            }
+            if extras[i]:
+                data.update(json.loads(extras[i]))
+            search_results[expand(search_names[i], name)] = data
+    
+        # Restore the original key order
+        ordered = {}
+        for key, value in results.items():
+            if key == "metadata" and "search_results" not in ordered:
+                ordered["search_results"] = search_results
+            ordered[key] = value
+        ordered.setdefault("search_results", search_results)
+        return ordered
+
+def load_results_file(path):
+    """Load results from a .json file (one run) or a .jsonl file (queue export)"""
+    with open(path, 'r') as f:
+        if path.lower().endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return [json.load(f)]
+
+def convert_archive(source, destination, subject=None):
+    """Convert between JSON/JSON-lines results and the .osa archive format"""
+    if source.lower().endswith(".osa"):
+        with ArchiveReader(source) as reader:
+            if subject is not None:
+                position = reader.find(subject)
+                if position is None:
+                    print(f"Error: {subject} is not in {source}")
+                    return 0
+                runs = [reader.read(position)]
+            else:
+                runs = list(reader)
+        with open(destination, 'w') as f:
+            if destination.lower().endswith(".jsonl"):
+                for results in runs:
+                    f.write(json.dumps(results) + "\n")
+            elif len(runs) == 1:
+                json.dump(runs[0], f, indent=4)
+            else:
+                json.dump(runs, f, indent=4)
+    else:
+        runs = load_results_file(source)
+        with ArchiveWriter(destination) as writer:
+            for results in runs:
+                writer.add(results)
+    print(f"✓ Converted {len(runs)} subjects from {source} to {destination}")
+    return len(runs)
+
+def benchmark_archive(paths):
+    """Compare size and read/write speed of the archive against the JSON and TXT formats"""
+    runs = []
+    for path in paths:
+        runs.extend(load_results_file(path))
+    temp_dir = tempfile.mkdtemp()
+    
+    def save_with(format_type):
+        # Write one file per subject exactly as save_results does
+        searcher = EnhancedOSINTSearcher()
+        files = []
+        for i, results in enumerate(runs):
+            searcher.results = dict(results, metadata=dict(results["metadata"], output_format=format_type))
+            searcher.output_file = os.path.join(temp_dir, f"subject_{i}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                searcher.save_results()
+            files.append(f"{searcher.output_file}.{format_type}")
+        return files
+    
+    def read_json(files):
+        for path in files:
+            with open(path, 'r') as f:
+                json.load(f)
+    
+    def write_json_gzip():
+        path = os.path.join(temp_dir, "runs.jsonl.gz")
+        with gzip.open(path, 'wt') as f:
+            for results in runs:
+                f.write(json.dumps(results) + "\n")
+        return [path]
+    
+    def read_json_gzip(files):
+        with gzip.open(files[0], 'rt') as f:
+            for line in f:
+                json.loads(line)
+    
+    def write_osa():
+        path = os.path.join(temp_dir, "runs.osa")
+        with ArchiveWriter(path) as writer:
+            for results in runs:
+                writer.add(results)
+        return [path]
+    
+    def read_osa(files):
+        with ArchiveReader(files[0]) as reader:
+            for _ in reader:
+                pass
+    
+    formats = [
+        ("json", lambda: save_with("json"), read_json),
+        ("txt", lambda: save_with("txt"), None),
+        ("jsonl.gz", write_json_gzip, read_json_gzip),
+        ("osa", write_osa, read_osa)
+    ]
+    
+    print(f"\nBenchmarking {len(runs)} subjects, {sum(len(results['search_results']) for results in runs)} results")
+    print(f"{'Format':<12}{'Size (bytes)':>14}{'Write (s)':>12}{'Read (s)':>12}")
+    try:
+        for label, writer, reader in formats:
+            start = time.perf_counter()
+            files = writer()
+            write_time = time.perf_counter() - start
+            size = sum(os.path.getsize(path) for path in files)
+            read_time = "-"
+            if reader is not None:
+                start = time.perf_counter()
+                reader(files)
+                read_time = f"{time.perf_counter() - start:.4f}"
+            print(f"{label:<12}{size:>14}{write_time:>12.4f}{read_time:>12}")
+    
+        with ArchiveReader(os.path.join(temp_dir, "runs.osa")) as reader:
+            start = time.perf_counter()
+            reader.read(len(reader) // 2)
+            print(f"osa random access to one subject: {time.perf_counter() - start:.6f}s")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
 def search_person(self):
     """Enhanced main search function that coordinates various search methods"""
     if not self.results["subject_info"].get("name"):
@@ -772,20 +3208,24 @@ def search_person(self):
     
     # NEW: Advanced Google dorking
     name = self.results["subject_info"]["name"]
-    dork_count = self.perform_google_dorking(name)
-    print(f"Generated {dork_count} Google dork searches")
+    if self.results["metadata"].get("use_dorking", True):
+        dork_count = self.perform_google_dorking(name)
+        print(f"Generated {dork_count} Google dork searches")
     
     # NEW: Dark web and breach indicators
-    breach_count = self.search_dark_web_indicators()
-    print(f"Generated {breach_count} breach indicator resources")
+    if self.results["metadata"].get("check_breaches", True):
+        breach_count = self.search_dark_web_indicators()
+        print(f"Generated {breach_count} breach indicator resources")
     
     # NEW: Archived content searches
-    archive_count = self.search_archived_content()
-    print(f"Generated {archive_count} web archive searches")
+    if self.results["metadata"].get("search_archives", True):
+        archive_count = self.search_archived_content()
+        print(f"Generated {archive_count} web archive searches")
     
     # NEW: Professional network searches
-    professional_count = self.search_professional_networks()
-    print(f"Generated {professional_count} professional network searches")
+    if self.results["metadata"].get("search_professional", True):
+        professional_count = self.search_professional_networks()
+        print(f"Generated {professional_count} professional network searches")
     
     # Continue with original search methods
     if self.results["subject_info"].get("emails"):
@@ -822,8 +3262,54 @@ def search_person(self):
         for relative in self.results["subject_info"]["relatives"]:
             self.search_by_relative(relative)
     
+    # Merge near-identical dorks to save rate-limit budget
+    if self.results["metadata"].get("compile_dorks"):
+        self.compile_dorks()
+    
+    # Pivot on identifiers discovered in fetched pages
+    graph = None
+    if self.results["metadata"].get("pivot"):
+        graph = self.run_pivot_engine(self.results["metadata"].get("pivot_depth", PIVOT_MAX_DEPTH),
+                                      self.results["metadata"].get("pivot_budget", PIVOT_BUDGET))
+        if not self.results["metadata"].get("save_output", True):
+            self.results["entity_graph"] = graph.to_json()
+        else:
+            graph_file = self.results["metadata"].get("graph_output") or f"{self.output_file}_graph.json"
+            try:
+                graph.export(graph_file)
+                print(f"Entity graph saved to {graph_file}")
+            except OSError as e:
+                print(f"Error saving entity graph: {e}")
+    
+    # Enrich known and discovered usernames with GitHub profile data
+    if self.results["metadata"].get("github"):
+        usernames = list(self.results["subject_info"].get("usernames", []))
+        if graph is not None:
+            usernames += [value for kind, value in zip(graph.node_kinds, graph.node_values) if kind == "username"]
+        if usernames:
+            self.enrich_github_profiles(usernames)
+    
+    # Generate and verify likely email addresses
+    if self.results["metadata"].get("email_permutations"):
+        self.verify_email_candidates()
+    
+    # Compare with the previous run for this subject
+    if self.results["metadata"].get("diff"):
+        self.detect_changes(self.results["metadata"].get("diff_against"))
+    
+    # Order results by relevance to the subject
+    if self.results["metadata"].get("rank", True):
+        self.rank_results()
+    
     # Update metadata
     self.results["metadata"]["search_count"] = len(self.results["search_results"])
+    METRICS.inc("osint_subjects_processed_total")
+    for data in self.results["search_results"].values():
+        METRICS.inc("osint_results_total", (("category", data["category"]),))
+    
+    # Queue workers send results back to the queue store instead of saving them
+    if not self.results["metadata"].get("save_output", True):
+        return True
     
     # Save results
     self.save_results()
@@ -837,6 +3323,62 @@ def search_person(self):
     
     return True
 
+# Attach the enhanced search functions to the searcher
+EnhancedOSINTSearcher.perform_google_dorking = perform_google_dorking
+EnhancedOSINTSearcher.search_dark_web_indicators = search_dark_web_indicators
+EnhancedOSINTSearcher.search_archived_content = search_archived_content
+EnhancedOSINTSearcher.query_wayback_timelines = query_wayback_timelines
+EnhancedOSINTSearcher.get_cdx_timeline = get_cdx_timeline
+EnhancedOSINTSearcher.iter_cdx_rows = iter_cdx_rows
+EnhancedOSINTSearcher.search_professional_networks = search_professional_networks
+EnhancedOSINTSearcher.check_pwned_passwords = check_pwned_passwords
+EnhancedOSINTSearcher.build_image_index = build_image_index
+EnhancedOSINTSearcher.match_image_corpus = match_image_corpus
+EnhancedOSINTSearcher.compile_dorks = compile_dorks
+EnhancedOSINTSearcher.find_previous_run = find_previous_run
+EnhancedOSINTSearcher.rank_results = rank_results
+EnhancedOSINTSearcher.github_throttle = github_throttle
+EnhancedOSINTSearcher.fetch_github_graphql = fetch_github_graphql
+EnhancedOSINTSearcher.fetch_github_rest = fetch_github_rest
+EnhancedOSINTSearcher.enrich_github_profiles = enrich_github_profiles
+EnhancedOSINTSearcher.verify_email_candidates = verify_email_candidates
+EnhancedOSINTSearcher.top_results = top_results
+EnhancedOSINTSearcher.detect_changes = detect_changes
+EnhancedOSINTSearcher.fetch_page = fetch_page
+EnhancedOSINTSearcher.run_pivot_engine = run_pivot_engine
+EnhancedOSINTSearcher.search_person = search_person
+
+def search_options_from_args(args):
+    """Build the advanced search metadata options from parsed arguments"""
+    return {
+        "image_corpus": args.image_corpus,
+        "image_refresh": not args.no_image_refresh,
+        "use_dorking": args.dorking or args.all,
+        "search_archives": args.archives or args.all,
+        "check_breaches": args.breaches or args.all,
+        "search_professional": args.professional or args.all,
+        "cdx_lookup": args.cdx or args.all,
+        "cdx_endpoint": args.cdx_endpoint,
+        "compile_dorks": args.compile_dorks,
+        "pivot": args.pivot,
+        "pivot_depth": args.pivot_depth,
+        "pivot_budget": args.pivot_budget,
+        "graph_output": args.graph_output,
+        "github": args.github or args.all,
+        "github_api": args.github_api,
+        "email_permutations": args.email_permutations,
+        "employer_domains": args.employer_domain,
+        "smtp_from": args.smtp_from,
+        "smtp_helo": args.smtp_helo,
+        "smtp_host": args.smtp_host,
+        "smtp_port": args.smtp_port,
+        "rank": not args.no_rank,
+        "diff": args.diff or bool(args.diff_against),
+        "diff_against": args.diff_against,
+        "pwned_db": args.pwned_db,
+        "password_file": args.password_file
+    }
+
 def main():
     parser = argparse.ArgumentParser(description="Enhanced OSINT Search Tool")
     parser.add_argument("--interactive", "-i", action="store_true", help="Run in interactive mode")
@@ -850,17 +3392,98 @@ def main():
     parser.add_argument("--education", action="append", help="Educational institution (can be used multiple times)")
     parser.add_argument("--relative", action="append", help="Relative (can be used multiple times)")
     parser.add_argument("--photo", help="Path to photo for reverse image search")
+    parser.add_argument("--image-corpus", help="Directory of images to match the photo against")
+    parser.add_argument("--no-image-refresh", action="store_true", help="Match against the existing image index without rescanning the corpus")
     parser.add_argument("--output", "-o", help="Output file name (without extension)")
-    parser.add_argument("--format", "-f", choices=["json", "txt"], default="json", help="Output format (json or txt)")
+    parser.add_argument("--format", "-f", choices=["json", "txt", "osa"], default="json", help="Output format (json, txt or osa compressed archive)")
     parser.add_argument("--browser", action="store_true", help="Open results in browser")
     parser.add_argument("--dorking", "-d", action="store_true", help="Enable advanced Google dorking")
     parser.add_argument("--archives", action="store_true", help="Search web archives")
     parser.add_argument("--breaches", action="store_true", help="Check for data breach indicators")
     parser.add_argument("--professional", action="store_true", help="Search professional networks")
+    parser.add_argument("--cdx", action="store_true", help="Query the Wayback CDX API for capture timelines (with --archives)")
+    parser.add_argument("--cdx-endpoint", default=WAYBACK_CDX_ENDPOINT, help="Wayback CDX API endpoint")
     parser.add_argument("--all", action="store_true", help="Enable all advanced search features")
+    parser.add_argument("--compile-dorks", action="store_true", help="Merge near-identical Google dorks into OR-queries")
+    parser.add_argument("--pivot", action="store_true", help="Fetch result pages and pivot on newly discovered identifiers")
+    parser.add_argument("--pivot-depth", type=int, default=PIVOT_MAX_DEPTH, help=f"Pivot depth limit (default: {PIVOT_MAX_DEPTH})")
+    parser.add_argument("--pivot-budget", type=int, default=PIVOT_BUDGET, help=f"Maximum pages fetched while pivoting (default: {PIVOT_BUDGET})")
+    parser.add_argument("--graph-output", help="Entity graph file (.graphml or .json)")
+    parser.add_argument("--github", action="store_true", help="Enrich usernames with GitHub profile data")
+    parser.add_argument("--github-token", default=os.environ.get("GITHUB_TOKEN"), help="GitHub token for batched GraphQL lookups (default: $GITHUB_TOKEN)")
+    parser.add_argument("--github-api", default=GITHUB_API_URL, help="GitHub API base URL")
+    parser.add_argument("--email-permutations", action="store_true", help="Generate likely email addresses and verify them over SMTP")
+    parser.add_argument("--employer-domain", action="append", help="Employer email domain for --email-permutations (can be used multiple times)")
+    parser.add_argument("--smtp-from", default="", help="MAIL FROM address for SMTP verification (default: null sender)")
+    parser.add_argument("--smtp-helo", help="EHLO name for SMTP verification (default: this host's FQDN)")
+    parser.add_argument("--smtp-host", help="Send all SMTP checks to this host instead of the domains' MX hosts")
+    parser.add_argument("--smtp-port", type=int, default=SMTP_PORT, help=f"SMTP port (default: {SMTP_PORT})")
+    parser.add_argument("--no-rank", action="store_true", help="Keep results in generation order instead of ranking by relevance")
+    parser.add_argument("--diff", action="store_true", help="Flag results that changed since the previous run for this subject")
+    parser.add_argument("--diff-against", metavar="FILE", help="Previous .json or .osa run to compare against (implies --diff)")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-file", help=f"Write Prometheus metrics to this file every {METRICS_INTERVAL} seconds")
+    parser.add_argument("--queue", help="Work queue: redis://host:port/db or a SQLite file path")
+    parser.add_argument("--enqueue", metavar="WATCHLIST", help="Enqueue a JSON-lines watchlist of subjects into --queue and exit")
+    parser.add_argument("--chunk-size", type=int, default=QUEUE_CHUNK_SIZE, help=f"Subjects per queued chunk (default: {QUEUE_CHUNK_SIZE})")
+    parser.add_argument("--worker", action="store_true", help="Process subjects from --queue until it is drained")
+    parser.add_argument("--lease-seconds", type=int, default=QUEUE_LEASE_SECONDS, help=f"Chunk lease duration (default: {QUEUE_LEASE_SECONDS})")
+    parser.add_argument("--queue-export", metavar="FILE", help="Export results stored in --queue to a JSON-lines file and exit")
+    parser.add_argument("--archive-convert", nargs=2, metavar=("SOURCE", "DEST"), help="Convert results between .json/.jsonl and .osa and exit")
+    parser.add_argument("--archive-subject", help="Only extract this subject with --archive-convert from .osa")
+    parser.add_argument("--archive-benchmark", nargs="+", metavar="FILE", help="Benchmark .osa against JSON and TXT on .json/.jsonl results and exit")
+    parser.add_argument("--pwned-db", help="Offline Pwned Passwords index file")
+    parser.add_argument("--pwned-ingest", help="Build --pwned-db from a Pwned Passwords HASH:COUNT corpus and exit")
+    parser.add_argument("--pwned-serve", type=int, metavar="PORT", help="Serve --pwned-db as a local range API and exit")
+    parser.add_argument("--password-file", help="File of passwords (one per line) to check against --pwned-db (with --breaches)")
     
     args = parser.parse_args()
     
+    # Standalone Pwned Passwords modes
+    if args.pwned_ingest or args.pwned_serve:
+        if not args.pwned_db:
+            print("Error: --pwned-db is required with --pwned-ingest and --pwned-serve.")
+            return
+        if args.pwned_ingest:
+            ingest_pwned_passwords(args.pwned_ingest, args.pwned_db)
+        if args.pwned_serve:
+            serve_pwned_range_api(args.pwned_db, args.pwned_serve)
+        return
+    
+    # Optional live metrics
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    if args.metrics_file:
+        start_metrics_file_writer(args.metrics_file)
+    
+    # Standalone archive modes
+    if args.archive_convert:
+        convert_archive(args.archive_convert[0], args.archive_convert[1], args.archive_subject)
+        return
+    if args.archive_benchmark:
+        benchmark_archive(args.archive_benchmark)
+        return
+    
+    # Distributed work queue modes
+    if args.enqueue or args.worker or args.queue_export:
+        if not args.queue:
+            print("Error: --queue is required with --enqueue, --worker and --queue-export.")
+            return
+        try:
+            backend = open_queue_backend(args.queue)
+        except ValueError as e:
+            print(f"Error opening queue: {e}")
+            return
+        if args.enqueue:
+            enqueue_watchlist(backend, args.enqueue, args.chunk_size)
+        if args.worker:
+            run_queue_worker(backend, search_options_from_args(args), args.lease_seconds, github_token=args.github_token)
+        if args.queue_export:
+            export_queue_results(backend, args.queue_export)
+        if args.metrics_file:
+            write_metrics_file(args.metrics_file)
+        return
+    
     searcher = EnhancedOSINTSearcher()
     
     # Check for interactive mode
@@ -914,13 +3537,14 @@ def main():
         searcher.results["metadata"]["open_browser"] = args.browser
         
         # Set advanced search options
-        searcher.results["metadata"]["use_dorking"] = args.dorking or args.all
-        searcher.results["metadata"]["search_archives"] = args.archives or args.all
-        searcher.results["metadata"]["check_breaches"] = args.breaches or args.all
-        searcher.results["metadata"]["search_professional"] = args.professional or args.all
+        searcher.results["metadata"].update(search_options_from_args(args))
+        searcher.github_token = args.github_token
         
         # Run search
         searcher.search_person()
+    
+    if args.metrics_file:
+        write_metrics_file(args.metrics_file)
 
 if __name__ == "__main__":
     main()
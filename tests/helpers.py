@@ -0,0 +1,74 @@
+"""Local stub servers for tests"""
+
+import contextlib
+import http.server
+import socketserver
+import threading
+import time
+
+
+@contextlib.contextmanager
+def stub_http_server(handler_class):
+    """Serve handler_class on 127.0.0.1 and yield the base URL"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue; RCPT is accepted for the server's valid addresses or catch-all domains"""
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self.wfile.write(b"220 stub ESMTP\r\n")
+            for line in self.rfile:
+                command = line.decode("ascii", "replace").strip()
+                verb = command[:4].upper()
+                if verb in ("EHLO", "HELO", "MAIL", "RSET", "NOOP"):
+                    self.wfile.write(b"250 OK\r\n")
+                elif verb == "RCPT":
+                    address = command.partition("<")[2].rstrip(">").lower()
+                    time.sleep(server.delay)
+                    with server.lock:
+                        server.recipients.append(address)
+                    accepted = address in server.valid or address.split("@")[-1] in server.catch_all
+                    self.wfile.write(b"250 OK\r\n" if accepted else b"550 No such user\r\n")
+                elif verb == "QUIT":
+                    self.wfile.write(b"221 Bye\r\n")
+                    return
+                else:
+                    self.wfile.write(b"502 Not implemented\r\n")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+@contextlib.contextmanager
+def stub_smtp_server(valid=(), catch_all=(), delay=0.0):
+    """Serve a stub SMTP server on 127.0.0.1 and yield it; its port is server.server_address[1]"""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), StubSMTPHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = server.active = server.max_active = 0
+    server.recipients = []
+    server.valid = set(valid)
+    server.catch_all = set(catch_all)
+    server.delay = delay
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,106 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+import osinttool
+
+
+def make_run(name, extra_info=""):
+    encoded = name.replace(" ", "+")
+    return {
+        "subject_info": {"name": name, "emails": [f"{name.split()[0].lower()}@example.com"] if name else []},
+        "search_results": {
+            f"Google Search ({name})": {
+                "url": f"https://www.google.com/search?q={encoded}",
+                "category": "Search Engines",
+                "info": f"Search results for {name}{extra_info}"
+            },
+            "Wayback - example.com": {
+                "url": "https://web.archive.org/web/*/example.com",
+                "category": "Web Archives",
+                "info": "Archived content search",
+                "timeline": {"capture_days": 12, "truncated": False}
+            }
+        },
+        "metadata": {"search_date": "2026-01-01 00:00:00", "output_format": "osa"}
+    }
+
+
+class ArchiveTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def write(self, name, runs):
+        with osinttool.ArchiveWriter(self.path(name)) as writer:
+            for run in runs:
+                writer.add(run)
+        return self.path(name)
+
+    def test_round_trip_with_nul_in_info(self):
+        runs = [make_run("Jane Doe", " weird \x00 Jane Doe"), make_run("John Roe"), make_run("")]
+        with osinttool.ArchiveReader(self.write("runs.osa", runs)) as reader:
+            self.assertEqual(list(reader), runs)
+
+    def test_random_access(self):
+        runs = [make_run(f"Person {i}") for i in range(20)]
+        with osinttool.ArchiveReader(self.write("runs.osa", runs)) as reader:
+            self.assertEqual(len(reader), 20)
+            self.assertEqual(reader.subjects()[3], "Person 3")
+            self.assertEqual(reader.read(reader.find("Person 17")), runs[17])
+            self.assertEqual(reader.read(0), runs[0])
+            self.assertIsNone(reader.find("Nobody"))
+
+    def test_columns_are_big_endian(self):
+        self.assertEqual(osinttool._pack_uint32([1, 2]), b"\x00\x00\x00\x01\x00\x00\x00\x02")
+
+    def test_reads_version_one_little_endian(self):
+        runs = [make_run("Jane Doe"), make_run("John Roe")]
+
+        def pack_little_endian(values):
+            return struct.pack(f"<{len(values)}I", *values)
+
+        with mock.patch.object(osinttool, "ARCHIVE_VERSION", 1), \
+                mock.patch.object(osinttool, "_pack_uint32", pack_little_endian):
+            path = self.write("v1.osa", runs)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(len(osinttool.ARCHIVE_MAGIC) + 1), osinttool.ARCHIVE_MAGIC + b"\x01")
+        with osinttool.ArchiveReader(path) as reader:
+            self.assertEqual(list(reader), runs)
+
+    def test_rejects_other_files(self):
+        path = self.path("not.osa")
+        with open(path, "wb") as f:
+            f.write(b"not an archive at all")
+        with self.assertRaises(ValueError):
+            osinttool.ArchiveReader(path)
+
+    def test_convert_both_directions(self):
+        runs = [make_run("Jane Doe"), make_run("John Roe")]
+        jsonl_path = self.path("runs.jsonl")
+        with open(jsonl_path, "w") as f:
+            for run in runs:
+                f.write(json.dumps(run) + "\n")
+
+        self.assertEqual(osinttool.convert_archive(jsonl_path, self.path("runs.osa")), 2)
+        self.assertEqual(osinttool.convert_archive(self.path("runs.osa"), self.path("back.jsonl")), 2)
+        self.assertEqual(osinttool.load_results_file(self.path("back.jsonl")), runs)
+
+        self.assertEqual(osinttool.convert_archive(self.path("runs.osa"), self.path("john.json"), subject="John Roe"), 1)
+        self.assertEqual(osinttool.load_results_file(self.path("john.json")), [runs[1]])
+        self.assertEqual(osinttool.convert_archive(self.path("john.json"), self.path("john.osa")), 1)
+        with osinttool.ArchiveReader(self.path("john.osa")) as reader:
+            self.assertEqual(list(reader), [runs[1]])
+
+        self.assertEqual(osinttool.convert_archive(self.path("runs.osa"), self.path("none.json"), subject="Nobody"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import http.server
+import os
+import tempfile
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import osinttool
+from tests.helpers import stub_http_server
+
+PAGE_SIZE = 1000
+PAGES = 3
+
+
+def fixture_rows(page):
+    """One capture per day; two digests alternate so there are two distinct versions"""
+    for day in range(page * PAGE_SIZE, (page + 1) * PAGE_SIZE):
+        year, day_of_year = 2000 + day // 360, day % 360
+        timestamp = f"{year}{day_of_year // 30 + 1:02d}{day_of_year % 30 + 1:02d}120000"
+        yield f"{timestamp} 200 DIGEST{day % 2}"
+
+
+class CDXHandler(http.server.BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        type(self).requests_seen.append(params)
+        page = int(params["resumeKey"][0]) if "resumeKey" in params else 0
+        lines = list(fixture_rows(page))
+        if page + 1 < PAGES:
+            lines += ["", str(page + 1)]
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CDXTimelineTest(unittest.TestCase):
+    def setUp(self):
+        CDXHandler.requests_seen = []
+        self.cache_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(osinttool, "CACHE_DIR", self.cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.cache_dir.cleanup)
+        self.searcher = osinttool.EnhancedOSINTSearcher()
+
+    def test_rows_stream_page_by_page(self):
+        with stub_http_server(CDXHandler) as endpoint:
+            rows = self.searcher.iter_cdx_rows(endpoint, "example.org/*")
+            first = next(rows)
+            self.assertEqual(len(CDXHandler.requests_seen), 1)
+            self.assertEqual(first, next(fixture_rows(0)).split())
+            self.assertEqual(sum(1 for _ in rows) + 1, PAGES * PAGE_SIZE)
+        self.assertEqual([params.get("resumeKey") for params in CDXHandler.requests_seen], [None, ["1"], ["2"]])
+
+    def test_timeline_is_merged_into_results(self):
+        self.searcher.results["subject_info"] = {"name": "Jane Doe", "emails": ["jane@example.org", "jane@gmail.com"]}
+        with stub_http_server(CDXHandler) as endpoint:
+            self.searcher.results["metadata"].update({"cdx_lookup": True, "cdx_endpoint": endpoint})
+            self.searcher.search_archived_content()
+
+        self.assertNotIn("Wayback - gmail.com", self.searcher.results["search_results"])
+        timeline = self.searcher.results["search_results"]["Wayback - example.org"]["timeline"]
+        self.assertEqual(timeline["capture_days"], PAGES * PAGE_SIZE)
+        self.assertEqual(timeline["distinct_digests"], 2)
+        self.assertEqual(timeline["first_seen"], "2000-01-01 12:00:00")
+        self.assertEqual(timeline["last_seen"], "2008-04-30 12:00:00")
+        self.assertFalse(timeline["truncated"])
+
+    def test_page_limit_marks_timeline_truncated(self):
+        with stub_http_server(CDXHandler) as endpoint, mock.patch.object(osinttool, "CDX_MAX_PAGES", 2):
+            self.searcher.results["metadata"]["cdx_endpoint"] = endpoint
+            timeline = self.searcher.get_cdx_timeline("example.org/*")
+        self.assertTrue(timeline["truncated"])
+        self.assertEqual(timeline["capture_days"], 2 * PAGE_SIZE)
+
+    def test_cache_expires(self):
+        with stub_http_server(CDXHandler) as endpoint:
+            self.searcher.results["metadata"]["cdx_endpoint"] = endpoint
+            self.searcher.get_cdx_timeline("example.org/*")
+            self.searcher.get_cdx_timeline("example.org/*")
+            self.assertEqual(len(CDXHandler.requests_seen), PAGES)
+
+            for name in os.listdir(self.cache_dir.name):
+                path = os.path.join(self.cache_dir.name, name)
+                os.utime(path, (0, 0))
+            self.searcher.get_cdx_timeline("example.org/*")
+            self.assertEqual(len(CDXHandler.requests_seen), 2 * PAGES)
+
+
+if __name__ == "__main__":
+    unittest.main()
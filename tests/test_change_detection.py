@@ -0,0 +1,104 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import osinttool
+
+
+def result(url, **fields):
+    return dict({"url": url, "category": "Web", "info": ""}, **fields)
+
+
+def fingerprint(value):
+    return format(value, "016x")
+
+
+class DetectChangesTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.searcher = osinttool.EnhancedOSINTSearcher()
+        self.searcher.results["subject_info"] = {"name": "Jane Doe"}
+        self.searcher.output_file = os.path.join(self.directory, "osint_jane_doe_300")
+
+    def write_json(self, run_time, search_results):
+        path = os.path.join(self.directory, f"osint_jane_doe_{run_time}.json")
+        with open(path, "w") as f:
+            json.dump({"subject_info": {"name": "Jane Doe"}, "search_results": search_results, "metadata": {}}, f)
+        return path
+
+    def test_changes_are_classified(self):
+        threshold = osinttool.SIMHASH_THRESHOLD
+        base = 0x0123456789ABCDEF
+        within_margin = base ^ ((1 << threshold) - 1)
+        beyond_margin = base ^ ((1 << (threshold + 1)) - 1)
+        self.write_json(100, {
+            "Same": result("https://a.example/same", status=200, simhash=fingerprint(base)),
+            "Status": result("https://a.example/status", status=200),
+            "Noise": result("https://a.example/noise", status=200, simhash=fingerprint(base)),
+            "Content": result("https://a.example/content", status=200, simhash=fingerprint(base)),
+            "Gone": result("https://a.example/gone")
+        })
+        self.searcher.results["search_results"] = {
+            "Same": result("https://a.example/same", status=200, simhash=fingerprint(base)),
+            "Status": result("https://a.example/status", status=404),
+            "Noise": result("https://a.example/noise", status=200, simhash=fingerprint(within_margin)),
+            "Content": result("https://a.example/content", status=200, simhash=fingerprint(beyond_margin)),
+            "Fresh": result("https://a.example/fresh")
+        }
+
+        changes = self.searcher.detect_changes()
+
+        self.assertEqual(changes["new"], ["Fresh"])
+        self.assertEqual(changes["status_changed"], ["Status"])
+        self.assertEqual(changes["content_changed"], ["Content"])
+        self.assertEqual(changes["removed"], ["https://a.example/gone"])
+        results = self.searcher.results["search_results"]
+        self.assertNotIn("change", results["Same"])
+        self.assertNotIn("change", results["Noise"])
+        self.assertEqual(results["Content"]["change"], "content_changed")
+
+    def test_simhash_margin_absorbs_page_noise(self):
+        rng = random.Random(7)
+        vocabulary = [f"word{i}" for i in range(500)]
+        words = [rng.choice(vocabulary) for _ in range(600)]
+        page = " ".join(words)
+        noisy = page.replace(words[100], "advert", 1) + " updated 2026-10-19 12:00"
+        rewritten = " ".join(words[:300] + [rng.choice(vocabulary) for _ in range(300)])
+
+        original = osinttool.simhash(page)
+        self.assertLessEqual(osinttool.hamming_distance(original, osinttool.simhash(noisy)), osinttool.SIMHASH_THRESHOLD)
+        self.assertGreater(osinttool.hamming_distance(original, osinttool.simhash(rewritten)), osinttool.SIMHASH_THRESHOLD)
+
+    def test_previous_run_found_across_json_and_osa(self):
+        self.write_json(100, {"Old": result("https://a.example/old")})
+        archived = {"subject_info": {"name": "Jane Doe"},
+                    "search_results": {"Archived": result("https://a.example/archived")}, "metadata": {}}
+        with osinttool.ArchiveWriter(os.path.join(self.directory, "osint_jane_doe_200.osa")) as writer:
+            writer.add({"subject_info": {"name": "Someone Else"}, "search_results": {}, "metadata": {}})
+            writer.add(archived)
+        # Neither the current run's own file, other subjects nor other formats are candidates
+        self.write_json(300, {})
+        self.write_json("smith_250", {})
+        with open(os.path.join(self.directory, "osint_jane_doe_250.txt"), "w") as f:
+            f.write("text output")
+
+        previous_path = self.searcher.find_previous_run()
+        self.assertEqual(os.path.basename(previous_path), "osint_jane_doe_200.osa")
+
+        self.searcher.results["search_results"] = {"Archived": result("https://a.example/archived")}
+        changes = self.searcher.detect_changes()
+        self.assertEqual(changes["previous_run"], previous_path)
+        self.assertEqual(changes["new"], [])
+        self.assertEqual(changes["removed"], [])
+
+    def test_no_previous_run(self):
+        self.searcher.results["search_results"] = {}
+        self.assertIsNone(self.searcher.detect_changes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+from urllib.parse import quote_plus
+
+import osinttool
+
+
+def covered(compiled):
+    return sorted(index for members, _ in compiled for index in members)
+
+
+class CompileDorkQueriesTest(unittest.TestCase):
+    def test_single_token_alternatives_are_merged(self):
+        compiled = osinttool.compile_dork_queries(['site:a.com "Jane Doe"', 'site:b.com "Jane Doe"', 'site:c.com "Jane Doe"'])
+        self.assertEqual(compiled, [([0, 1, 2], '(site:a.com OR site:b.com OR site:c.com) "Jane Doe"')])
+
+    def test_multi_word_spans_are_not_merged(self):
+        queries = ["site:linkedin.com Jane Doe Acme", "site:linkedin.com Jane Doe Globex Corp"]
+        self.assertEqual(osinttool.compile_dork_queries(queries), [([0], queries[0]), ([1], queries[1])])
+
+    def test_tokens_next_to_or_are_not_merged(self):
+        queries = ["Jane Doe OR Smith", "Jane Roe OR Smith"]
+        self.assertEqual(osinttool.compile_dork_queries(queries), [([0], queries[0]), ([1], queries[1])])
+
+    def test_duplicate_queries_share_one_alternative(self):
+        compiled = osinttool.compile_dork_queries(["Jane site:a.com", "Jane site:a.com", "Jane site:b.com"])
+        self.assertEqual(compiled, [([0, 1, 2], "Jane (site:a.com OR site:b.com)")])
+
+    def test_groups_split_at_term_limit(self):
+        queries = [f'("home" OR "cell") "Jane Doe" site:s{i}.com' for i in range(40)]
+        compiled = osinttool.compile_dork_queries(queries)
+        self.assertEqual(covered(compiled), list(range(40)))
+        self.assertGreater(len(compiled), 1)
+        self.assertLess(len(compiled), 40)
+        for _, query in compiled:
+            self.assertLessEqual(osinttool.count_query_terms(query), osinttool.GOOGLE_MAX_QUERY_TERMS)
+
+    def test_groups_split_at_url_length(self):
+        queries = [f"Jane Doe site:{'x' * 40}{i}.example.com" for i in range(20)]
+        with mock.patch.object(osinttool, "GOOGLE_MAX_URL_LENGTH", 300):
+            compiled = osinttool.compile_dork_queries(queries)
+        self.assertEqual(covered(compiled), list(range(20)))
+        self.assertGreater(len(compiled), 2)
+        for _, query in compiled:
+            self.assertLessEqual(len(osinttool.GOOGLE_SEARCH_URL + quote_plus(query)), 300)
+
+    def test_count_query_terms(self):
+        self.assertEqual(osinttool.count_query_terms('("home" OR "cell") "Jane Doe" site:a.com'), 6)
+
+
+class CompileDorksTest(unittest.TestCase):
+    def test_merged_from_covers_every_query(self):
+        searcher = osinttool.EnhancedOSINTSearcher()
+        results = searcher.results["search_results"]
+        sites = ["linkedin.com", "github.com", "twitter.com", "facebook.com"]
+        for site in sites:
+            results[f"Profile on {site}"] = {
+                "url": osinttool.GOOGLE_SEARCH_URL + quote_plus(f'site:{site} "Jane Doe"'),
+                "category": "Google Dorks",
+                "info": ""
+            }
+        results["Resume Search"] = {
+            "url": osinttool.GOOGLE_SEARCH_URL + quote_plus('"Jane Doe" filetype:pdf resume'),
+            "category": "Google Dorks",
+            "info": ""
+        }
+        results["Other Category"] = {"url": osinttool.GOOGLE_SEARCH_URL + "x", "category": "Email", "info": ""}
+        original = set(results)
+
+        saved = searcher.compile_dorks()
+
+        self.assertEqual(saved, 3)
+        merged = [(name, data) for name, data in results.items() if "merged_from" in data]
+        self.assertEqual(len(merged), 1)
+        name, data = merged[0]
+        self.assertEqual(sorted(data["merged_from"]), sorted(f"Profile on {site}" for site in sites))
+        for site in sites:
+            self.assertIn(quote_plus(f"site:{site}"), data["url"])
+        self.assertEqual(set(results) - {name} | set(data["merged_from"]), original)
+        self.assertEqual(searcher.results["metadata"]["dork_compiler"],
+                         {"queries_before": 5, "queries_after": 2, "queries_saved": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import osinttool
+from tests.helpers import stub_smtp_server
+
+
+class EmailCandidateTest(unittest.TestCase):
+    def test_patterns_are_normalised_and_deduplicated(self):
+        candidates = osinttool.generate_email_candidates("José van Doe", ["Acme.com", "acme.com"])
+        self.assertEqual(candidates[:4], ["jose.doe@acme.com", "josedoe@acme.com", "jdoe@acme.com", "j.doe@acme.com"])
+        self.assertEqual(len(candidates), len(set(candidates)))
+        self.assertEqual(len(candidates), len(osinttool.EMAIL_PATTERNS))
+
+    def test_single_name_only_uses_first(self):
+        self.assertEqual(osinttool.generate_email_candidates("Madonna", ["acme.com", "example.org"]),
+                         ["madonna@acme.com", "madonna@example.org"])
+
+
+class VerifyEmailCandidatesTest(unittest.TestCase):
+    def verify(self, server, **metadata):
+        searcher = osinttool.EnhancedOSINTSearcher()
+        searcher.results["subject_info"] = {"name": "Jane Doe", "emails": ["jane@gmail.com"], "employers": []}
+        searcher.results["metadata"].update(smtp_host="127.0.0.1", smtp_port=server.server_address[1], **metadata)
+        return searcher, searcher.verify_email_candidates()
+
+    def test_pooled_connections_and_catch_all(self):
+        with stub_smtp_server(valid={"jane.doe@acme.com"}, catch_all={"catchall.io"}, delay=0.01) as server:
+            searcher, statuses = self.verify(server, employer_domains=["acme.com", "catchall.io"])
+
+        per_domain = len(osinttool.EMAIL_PATTERNS)
+        self.assertEqual(len(statuses), 2 * per_domain)
+        self.assertEqual(statuses["jane.doe@acme.com"], "valid")
+        self.assertEqual(statuses["jdoe@acme.com"], "invalid")
+        self.assertTrue(all(status == "catch-all" for address, status in statuses.items() if address.endswith("@catchall.io")))
+        # Webmail domains are never probed
+        self.assertFalse(any(address.endswith("@gmail.com") for address in server.recipients))
+
+        # Every check, including the two catch-all probes, reuses at most SMTP_MAX_PER_HOST connections
+        self.assertEqual(len(server.recipients), 2 * per_domain + 2)
+        self.assertLessEqual(server.max_active, osinttool.SMTP_MAX_PER_HOST)
+        self.assertLessEqual(server.connections, osinttool.SMTP_MAX_PER_HOST)
+
+        results = searcher.results["search_results"]
+        self.assertEqual(results["Email Candidate (jane.doe@acme.com)"]["verification"], "valid")
+        self.assertNotIn("Email Candidate (jdoe@acme.com)", results)
+        self.assertEqual(searcher.results["metadata"]["email_verification"]["catch-all"], per_domain)
+
+    def test_mixed_case_domains(self):
+        with stub_smtp_server(valid={"jane.doe@acme.com"}) as server:
+            searcher, statuses = self.verify(server, employer_domains=[" Acme.COM ", "acme.com", "GMAIL.com"])
+        self.assertEqual(len(statuses), len(osinttool.EMAIL_PATTERNS))
+        self.assertEqual(statuses["jane.doe@acme.com"], "valid")
+        self.assertIn("Email Candidate (jane.doe@acme.com)", searcher.results["search_results"])
+
+    def test_unreachable_server_marks_unknown(self):
+        with stub_smtp_server() as server:
+            port = server.server_address[1]
+        searcher = osinttool.EnhancedOSINTSearcher()
+        searcher.results["subject_info"] = {"name": "Jane Doe", "emails": []}
+        searcher.results["metadata"].update(smtp_host="127.0.0.1", smtp_port=port, employer_domains=["acme.com"])
+        statuses = searcher.verify_email_candidates()
+        self.assertEqual(set(statuses.values()), {"unknown"})
+
+
+if __name__ == "__main__":
+    unittest.main()
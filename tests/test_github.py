@@ -0,0 +1,149 @@
+import http.server
+import json
+import os
+import re
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import osinttool
+from tests.helpers import stub_http_server
+
+RESET_AT = "2030-01-01T00:00:00Z"
+
+
+def user_node(login):
+    return {
+        "login": login,
+        "name": f"User {login}",
+        "company": "Acme",
+        "location": None,
+        "email": "",
+        "websiteUrl": None,
+        "url": f"https://github.com/{login}",
+        "organizations": {"nodes": [{"login": "acme"}]}
+    }
+
+
+class GitHubHandler(http.server.BaseHTTPRequestHandler):
+    graphql_queries = []
+    rest_requests = []
+    remaining = 4999
+    rest_remaining = 59
+
+    def send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).graphql_queries.append(payload)
+        data = {}
+        for alias, variable in re.findall(r"(u\d+): user\(login: \$(l\d+)\)", payload["query"]):
+            login = payload["variables"][variable]
+            # Logins starting with "ghost" do not exist
+            data[alias] = None if login.startswith("ghost") else user_node(login)
+        data["rateLimit"] = {"limit": 5000, "remaining": type(self).remaining, "resetAt": RESET_AT}
+        self.send_json(200, {"data": data})
+
+    def do_GET(self):
+        type(self).rest_requests.append((self.path, self.headers.get("If-None-Match")))
+        type(self).rest_remaining -= 1
+        rate = [("X-RateLimit-Limit", "60"), ("X-RateLimit-Remaining", str(type(self).rest_remaining)),
+                ("X-RateLimit-Reset", str(int(time.time()) + 3600))]
+        login = self.path.split("/")[2]
+        etag = f'"{self.path}"'
+        if login.startswith("ghost"):
+            self.send_json(404, {"message": "Not Found"}, rate)
+        elif self.headers.get("If-None-Match") == etag:
+            self.send_json(304, None, rate + [("ETag", etag)])
+        elif self.path.endswith("/orgs"):
+            self.send_json(200, [{"login": "acme"}], rate + [("ETag", etag)])
+        else:
+            self.send_json(200, {"login": login, "name": f"User {login}", "company": None, "location": "Berlin",
+                                 "email": None, "blog": "", "html_url": f"https://github.com/{login}"}, rate + [("ETag", etag)])
+
+    def log_message(self, *args):
+        pass
+
+
+class GitHubEnrichmentTest(unittest.TestCase):
+    def setUp(self):
+        GitHubHandler.graphql_queries = []
+        GitHubHandler.rest_requests = []
+        GitHubHandler.remaining = 4999
+        GitHubHandler.rest_remaining = 60
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        for name, value in (("CACHE_DIR", cache_dir.name), ("GITHUB_ETAG_CACHE", os.path.join(cache_dir.name, "etags.json"))):
+            patcher = mock.patch.object(osinttool, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.searcher = osinttool.EnhancedOSINTSearcher()
+
+    def enrich(self, base_url, usernames, token=None):
+        self.searcher.github_token = token
+        self.searcher.results["metadata"]["github_api"] = base_url
+        return self.searcher.enrich_github_profiles(usernames)
+
+    def test_graphql_chunks_aliased_lookups(self):
+        logins = [f"user{i}" for i in range(108)] + ["ghost1", "ghost2", "USER0"]
+        with stub_http_server(GitHubHandler) as base_url:
+            profiles = self.enrich(base_url, logins, token="token")
+
+        # 110 distinct logins in chunks of 50
+        self.assertEqual([len(query["variables"]) for query in GitHubHandler.graphql_queries], [50, 50, 10])
+        self.assertEqual(len(profiles), 108)
+        self.assertNotIn("ghost1", profiles)
+        self.assertEqual(profiles["user7"]["organizations"], ["acme"])
+        self.assertIsNone(profiles["user7"]["email"])
+        self.assertIn("GitHub Profile (user7)", self.searcher.results["search_results"])
+
+    def test_graphql_rate_limit_is_parsed(self):
+        with stub_http_server(GitHubHandler) as base_url:
+            self.enrich(base_url, ["user1"], token="token")
+        rate = self.searcher.github_rate_limit
+        self.assertEqual((rate["limit"], rate["remaining"]), (5000, 4999))
+        self.assertEqual(rate["reset"], 1893456000)
+
+    def test_graphql_throttles_below_reserve(self):
+        GitHubHandler.remaining = 10
+        with stub_http_server(GitHubHandler) as base_url, mock.patch.object(osinttool.time, "sleep") as sleep:
+            self.enrich(base_url, ["user1"], token="token")
+        sleep.assert_called_once()
+
+    def test_rest_fallback_reuses_etags(self):
+        with stub_http_server(GitHubHandler) as base_url, mock.patch.object(osinttool.time, "sleep") as sleep:
+            first = self.enrich(base_url, ["alice", "ghost"])
+            second = self.enrich(base_url, ["alice"])
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["alice"]["organizations"], ["acme"])
+        self.assertIsNone(first["alice"]["blog"])
+        self.assertEqual(GitHubHandler.rest_requests[-2:], [("/users/alice", '"/users/alice"'),
+                                                            ("/users/alice/orgs", '"/users/alice/orgs"')])
+        # Plenty of the unauthenticated quota of 60 is left
+        sleep.assert_not_called()
+        self.assertEqual(self.searcher.github_rate_limit["remaining"], 55)
+
+    def test_rest_fallback_throttles_on_not_modified(self):
+        with stub_http_server(GitHubHandler) as base_url:
+            self.enrich(base_url, ["alice"])
+            # A re-run over cached logins still uses up the quota
+            GitHubHandler.rest_remaining = 5
+            with mock.patch.object(osinttool.time, "sleep") as sleep:
+                profiles = self.enrich(base_url, ["alice"])
+        self.assertEqual(profiles["alice"]["login"], "alice")
+        self.assertEqual(GitHubHandler.rest_requests[-1][1], '"/users/alice/orgs"')
+        self.assertEqual(sleep.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import osinttool
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = Image = None
+
+
+@unittest.skipIf(np is None or Image is None, "numpy and Pillow are required")
+class ImageIndexTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        patcher = mock.patch.object(osinttool, "CACHE_DIR", os.path.join(self.root, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.corpus = self.make_corpus("corpus", 6)
+        self.searcher = osinttool.EnhancedOSINTSearcher()
+
+    def make_corpus(self, name, count):
+        corpus = os.path.join(self.root, name)
+        os.makedirs(corpus)
+        rng = np.random.default_rng(len(name))
+        for i in range(count):
+            Image.fromarray(rng.integers(0, 255, (48, 48, 3), dtype=np.uint8)).save(os.path.join(corpus, f"img{i}.png"))
+        return corpus
+
+    def index_lines(self, corpus):
+        with open(osinttool.image_index_paths(corpus)[0]) as f:
+            return [json.loads(line) for line in f]
+
+    def test_index_is_incremental_and_per_corpus(self):
+        other = self.make_corpus("other", 2)
+        with mock.patch.object(osinttool, "IMAGE_INDEX_BATCH", 2):
+            self.searcher.build_image_index(self.corpus)
+            self.searcher.build_image_index(other)
+        self.assertEqual(len(self.index_lines(self.corpus)), 6)
+        self.assertEqual(len(self.index_lines(other)), 2)
+
+        # Unchanged corpus: nothing is hashed again
+        with mock.patch.object(osinttool, "ProcessPoolExecutor") as executor:
+            self.searcher.build_image_index(self.corpus)
+        executor.assert_not_called()
+
+    def test_partial_index_is_reused(self):
+        # Entries already appended by an interrupted run are not hashed again
+        self.searcher.build_image_index(self.corpus)
+        index_path, table_path = osinttool.image_index_paths(self.corpus)
+        os.remove(table_path)
+        with open(index_path) as f:
+            lines = f.readlines()
+        with open(index_path, "w") as f:
+            f.writelines(lines[:4])
+
+        with mock.patch.object(osinttool, "_hash_image_entry", wraps=osinttool._hash_image_entry), \
+                mock.patch.object(osinttool, "ProcessPoolExecutor", osinttool.ThreadPoolExecutor):
+            self.searcher.build_image_index(self.corpus)
+            self.assertEqual(osinttool._hash_image_entry.call_count, 2)
+        self.assertEqual(len(self.index_lines(self.corpus)), 6)
+
+    def test_removed_files_compact_index(self):
+        self.searcher.build_image_index(self.corpus)
+        os.remove(os.path.join(self.corpus, "img0.png"))
+        os.symlink(os.path.join(self.root, "missing.png"), os.path.join(self.corpus, "broken.png"))
+        table_path = self.searcher.build_image_index(self.corpus)
+
+        self.assertEqual(len(self.index_lines(self.corpus)), 5)
+        table = osinttool.ImageHashTable(table_path)
+        try:
+            self.assertEqual(table.count, 5)
+            entry = self.index_lines(self.corpus)[0]
+            distance, match = table.search(entry["phash"], osinttool.IMAGE_MATCH_DISTANCE)[0]
+            self.assertEqual((distance, match["path"]), (0, entry["path"]))
+        finally:
+            table.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
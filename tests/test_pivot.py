@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+import osinttool
+
+PAGES = {
+    # Depth 0: the seed username's profile mentions the subject
+    "https://github.com/janed": "Jane Doe writes at jane@acme.org and @janedoe_dev. Contact support@github.com or @github.",
+    # Depth 0: a page that does not mention the subject is not expanded
+    "https://twitter.com/janed": "Someone else entirely: other@example.net @unrelated",
+    # Depth 1: the discovered email's lookup page
+    "https://thatsthem.com/email/jane%40acme.org": "Jane Doe, jane@acme.org, support@thatsthem.com, @deeper_handle, jane@gmail.com",
+    "https://github.com/janedoe_dev": "Jane Doe again: jane@acme.org"
+}
+
+
+class PivotEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.searcher = osinttool.EnhancedOSINTSearcher()
+        self.searcher.results["subject_info"] = {"name": "Jane Doe", "usernames": ["janed"]}
+        self.searcher.search_by_username("janed")
+        self.fetched = []
+
+        def fetch_page(url):
+            self.fetched.append(url)
+            return 200, PAGES.get(url, "<html>nothing here</html>")
+        self.searcher.fetch_page = fetch_page
+
+    def nodes(self, graph, kind):
+        return {value for node_kind, value in zip(graph.node_kinds, graph.node_values) if node_kind == kind}
+
+    def test_discovers_identifiers_from_relevant_pages_only(self):
+        graph = self.searcher.run_pivot_engine(max_depth=2, budget=50)
+
+        self.assertIn("jane@acme.org", self.nodes(graph, "email"))
+        self.assertIn("janedoe_dev", self.nodes(graph, "username"))
+        self.assertIn("deeper_handle", self.nodes(graph, "username"))
+        self.assertIn("jane@gmail.com", self.nodes(graph, "email"))
+        # The hosting site's own identifiers and webmail domains are not pivoted on
+        for domain in ("github.com", "thatsthem.com", "gmail.com"):
+            self.assertNotIn(domain, self.nodes(graph, "domain"))
+        self.assertNotIn("support@github.com", self.nodes(graph, "email"))
+        self.assertNotIn("support@thatsthem.com", self.nodes(graph, "email"))
+        self.assertNotIn("github", self.nodes(graph, "username"))
+        # Nothing from a page that never mentions the subject
+        self.assertNotIn("other@example.net", self.nodes(graph, "email"))
+        self.assertNotIn("unrelated", self.nodes(graph, "username"))
+        self.assertIn("WHOIS (acme.org)", self.searcher.results["search_results"])
+        self.assertNotIn("WHOIS (github.com)", self.searcher.results["search_results"])
+
+    def test_breadth_first_order_and_depth_limit(self):
+        seed_pages = {data["url"] for data in self.searcher.results["search_results"].values()}
+        self.searcher.run_pivot_engine(max_depth=2, budget=50)
+
+        depth_one = [url for url in self.fetched if url not in seed_pages]
+        self.assertTrue(depth_one)
+        # Every seed page is fetched before any page found at depth 1
+        self.assertEqual(set(self.fetched[:len(seed_pages)]), seed_pages)
+        # Identifiers found at depth 2 are searched but their pages are never fetched
+        self.assertIn("GitHub (deeper_handle)", self.searcher.results["search_results"])
+        self.assertNotIn("https://github.com/deeper_handle", self.fetched)
+
+    def test_depth_limit_of_one_fetches_seed_pages_only(self):
+        seed_pages = {data["url"] for data in self.searcher.results["search_results"].values()}
+        self.searcher.run_pivot_engine(max_depth=1, budget=50)
+        self.assertEqual(set(self.fetched), seed_pages)
+        self.assertIn("GitHub (janedoe_dev)", self.searcher.results["search_results"])
+
+    def test_budget_limits_fetches(self):
+        self.searcher.run_pivot_engine(max_depth=2, budget=3)
+        self.assertEqual(len(self.fetched), 3)
+        self.assertEqual(self.searcher.results["metadata"]["pivot"]["pages_fetched"], 3)
+
+    def test_frontier_is_deduplicated(self):
+        with mock.patch.object(self.searcher, "search_by_email", wraps=self.searcher.search_by_email) as search_by_email:
+            self.searcher.run_pivot_engine(max_depth=2, budget=50)
+        searched = [call.args[0] for call in search_by_email.call_args_list]
+        # jane@acme.org appears on three pages but is searched once
+        self.assertEqual(searched.count("jane@acme.org"), 1)
+        self.assertEqual(len(self.fetched), len(set(self.fetched)))
+
+    def test_export_graphml_and_json(self):
+        self.searcher.results["subject_info"]["name"] = "Jane & Doe"
+        graph = self.searcher.run_pivot_engine(max_depth=2, budget=50)
+        with tempfile.TemporaryDirectory() as directory:
+            graphml_path = os.path.join(directory, "graph.graphml")
+            json_path = os.path.join(directory, "graph.json")
+            graph.export(graphml_path)
+            graph.export(json_path)
+
+            namespace = {"g": "http://graphml.graphdrawing.org/xmlns"}
+            root = ET.parse(graphml_path).getroot()
+            nodes = root.findall("g:graph/g:node", namespace)
+            edges = root.findall("g:graph/g:edge", namespace)
+            with open(json_path) as f:
+                exported = json.load(f)
+
+        self.assertEqual(len(nodes), len(graph.node_kinds))
+        self.assertEqual(len(edges), len(graph.edge_src))
+        self.assertEqual(len(exported["nodes"]), len(nodes))
+        self.assertEqual(len(exported["edges"]), len(edges))
+        self.assertEqual(nodes[0].find("g:data[@key='value']", namespace).text, "Jane & Doe")
+        self.assertEqual({edge["label"] for edge in exported["edges"]}, {"identifies", "searched_via", "found_on"})
+
+        offsets, targets = graph.adjacency()
+        self.assertEqual(offsets[-1], len(graph.edge_src))
+        subject_targets = set(targets[offsets[0]:offsets[1]])
+        self.assertEqual(subject_targets, {graph.node_ids[("username", "janed")]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+import osinttool
+
+
+def sha1(password):
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+class PwnedPasswordsIndexTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def ingest(self, lines):
+        corpus_path = os.path.join(self.directory, "corpus.txt")
+        db_path = os.path.join(self.directory, "pwned.db")
+        with open(corpus_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        total = osinttool.ingest_pwned_passwords(corpus_path, db_path)
+        index = osinttool.PwnedPasswordsIndex(db_path)
+        self.addCleanup(index.close)
+        return total, index
+
+    def test_malformed_lines_are_skipped(self):
+        total, index = self.ingest([
+            f"\ufeff{sha1('first')}:7",
+            "HASH:COUNT",
+            "not a hash at all",
+            "ABC:12",
+            f"{sha1('password')}:10",
+            f"{sha1('letmein')}:x",
+            "",
+            f"{sha1('hunter2')}:3"
+        ])
+        self.assertEqual(total, 3)
+        self.assertEqual(index.lookup(sha1("first")), 7)
+        self.assertEqual(index.lookup(sha1("password")), 10)
+        self.assertEqual(index.lookup(sha1("hunter2")), 3)
+        self.assertEqual(index.lookup(sha1("letmein")), 0)
+
+    def test_duplicate_hashes_are_merged(self):
+        total, index = self.ingest([f"{sha1('password')}:10", f"{sha1('other')}:1", f"{sha1('password').lower()}:5"])
+        self.assertEqual(total, 2)
+        self.assertEqual(index.lookup(sha1("password")), 15)
+
+    def test_range_bucket_edges(self):
+        low = "00000" + "0" * 35
+        low_next = "00001" + "0" * 35
+        high = "FFFFF" + "A" * 35
+        high_last = "F" * 40
+        high_prev = "FFFFE" + "F" * 35
+        total, index = self.ingest([f"{value}:{i + 1}" for i, value in enumerate([high_last, low, high, low_next, high_prev])])
+        self.assertEqual(total, 5)
+        self.assertEqual(index.range("00000"), [("0" * 35, 2)])
+        self.assertEqual(index.range("00001"), [("0" * 35, 4)])
+        self.assertEqual(index.range("fffff"), [("A" * 35, 3), ("F" * 35, 1)])
+        self.assertEqual(index.range("FFFFE"), [("F" * 35, 5)])
+        self.assertEqual(index.range("12345"), [])
+        with self.assertRaises(ValueError):
+            index.range("0000")
+
+    def test_ntlm_index(self):
+        ntlm = osinttool.hash_password("password", 16)
+        self.assertEqual(ntlm, "8846F7EAEE8FB117AD06BDD830B7586C")
+        total, index = self.ingest([f"{ntlm}:42", f"{sha1('skipped')}:1"])
+        self.assertEqual((total, index.hash_len), (1, 16))
+        self.assertEqual(index.lookup(ntlm), 42)
+
+    def test_md4_vectors(self):
+        vectors = {
+            b"": "31d6cfe0d16ae931b73c59d7e0c089c0",
+            b"abc": "a448017aaf21d8525fc10ae87aa6729d",
+            b"message digest": "d9130a8164549fe818874806e1c7014b",
+            b"1234567890" * 8: "e33b4ddc9c38f2199c3e7b164fcc0536"
+        }
+        for data, digest in vectors.items():
+            self.assertEqual(osinttool.md4_digest(data).hex(), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
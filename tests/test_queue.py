@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import osinttool
+
+
+class QueueBackendTests:
+    """Lease behaviour shared by every backend"""
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.backend = self.make_backend()
+        self.backend.enqueue([[{"name": "Jane Doe"}], [{"name": "John Roe"}]])
+
+    def test_expired_lease_is_requeued(self):
+        chunk_id, _ = self.backend.lease("worker-a", 0.05)
+        time.sleep(0.1)
+        leases = [self.backend.lease("worker-b", 60) for _ in range(2)]
+        self.assertIn(chunk_id, [lease[0] for lease in leases])
+        self.assertIsNone(self.backend.lease("worker-c", 60))
+
+    def test_lost_lease_cannot_complete(self):
+        chunk_id, subjects = self.backend.lease("worker-a", 0.05)
+        time.sleep(0.1)
+        while True:
+            lease = self.backend.lease("worker-b", 60)
+            if lease[0] == chunk_id:
+                break
+
+        self.assertFalse(self.backend.renew(chunk_id, "worker-a", 60))
+        self.assertFalse(self.backend.complete(chunk_id, "worker-a", [{"subject_info": {"name": "stale"}}]))
+        self.assertTrue(self.backend.complete(chunk_id, "worker-b", [{"subject_info": {"name": "fresh"}}]))
+        self.assertEqual(list(self.backend.iter_results()), [{"subject_info": {"name": "fresh"}}])
+
+    def test_counts(self):
+        self.backend.lease("worker-a", 60)
+        self.assertEqual(self.backend.counts(), {"pending": 1, "leased": 1, "done": 0})
+
+
+class MemoryQueueBackendTest(QueueBackendTests, unittest.TestCase):
+    def make_backend(self):
+        return osinttool.MemoryQueueBackend()
+
+
+class SQLiteQueueBackendTest(QueueBackendTests, unittest.TestCase):
+    def make_backend(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return osinttool.SQLiteQueueBackend(os.path.join(directory.name, "queue.db"))
+
+
+class RunQueueWorkerTest(unittest.TestCase):
+    def test_worker_drains_queue_with_token(self):
+        backend = osinttool.MemoryQueueBackend()
+        backend.enqueue([[{"name": "Jane Doe"}, {"name": "John Roe"}], [{"name": "Ann Poe"}]])
+        tokens = []
+
+        def search_person(searcher):
+            tokens.append(searcher.github_token)
+            self.assertFalse(searcher.results["metadata"]["save_output"])
+            return True
+
+        with mock.patch.object(osinttool.EnhancedOSINTSearcher, "search_person", search_person):
+            processed = osinttool.run_queue_worker(backend, {"github": True}, worker_id="worker-a", github_token="token")
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(tokens, ["token"] * 3)
+        self.assertEqual(sorted(result["subject_info"]["name"] for result in backend.iter_results()),
+                         ["Ann Poe", "Jane Doe", "John Roe"])
+        self.assertEqual(backend.counts(), {"pending": 0, "leased": 0, "done": 2})
+
+    def test_worker_discards_chunk_after_losing_lease(self):
+        backend = osinttool.MemoryQueueBackend()
+        backend.enqueue([[{"name": "Jane Doe"}, {"name": "John Roe"}]])
+
+        def search_person(searcher):
+            # Another worker takes over the chunk while the first subject is searched
+            with backend.lock:
+                backend.leases[1] = ("worker-b", time.time() + 60)
+            return True
+
+        # The chunk stays leased to worker-b, so report the queue as drained after the first lease
+        with mock.patch.object(osinttool.EnhancedOSINTSearcher, "search_person", search_person), \
+                mock.patch.object(backend, "lease", side_effect=[(1, backend.chunks[1]), None]), \
+                mock.patch.object(backend, "counts", return_value={"pending": 0, "leased": 0, "done": 0}):
+            processed = osinttool.run_queue_worker(backend, {}, worker_id="worker-a")
+
+        self.assertEqual(processed, 0)
+        self.assertEqual(backend.done, 0)
+        self.assertEqual(list(backend.iter_results()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
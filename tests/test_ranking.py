@@ -0,0 +1,75 @@
+import copy
+import unittest
+from unittest import mock
+
+import osinttool
+
+
+def make_searcher():
+    searcher = osinttool.EnhancedOSINTSearcher()
+    searcher.results["subject_info"] = {
+        "name": "Jane Doe",
+        "birth": {"place": "Springfield"},
+        "addresses": ["12 Elm Street, Shelbyville"]
+    }
+    searcher.results["search_results"] = {
+        "Generic Directory": {"url": "https://directory.example/search", "category": "People Directories", "info": "Directory search"},
+        "Google Search (Jane Doe)": {"url": "https://www.google.com/search?q=Jane+Doe", "category": "Search Engines",
+                                     "info": "Search results for Jane Doe"},
+        "Profile Page": {"url": "https://social.example/janedoe", "category": "Social Media", "info": "Profile for Jane Doe",
+                         "identifier_hits": 3, "location_hits": 1, "status": 200},
+        "Broken Page": {"url": "https://broken.example/jane-doe", "category": "Social Media", "info": "Jane Doe",
+                        "status": 404},
+        "Local News": {"url": "https://news.example/springfield", "category": "Web Archives",
+                       "info": "Springfield and Shelbyville news"},
+        "Doe Family": {"url": "https://family.example/doe", "category": "Relatives", "info": "Doe family tree, Doe relatives"}
+    }
+    return searcher
+
+
+class RankResultsTest(unittest.TestCase):
+    def test_numpy_and_pure_python_scores_match(self):
+        if osinttool.np is None:
+            self.skipTest("numpy is not installed")
+        with_numpy = make_searcher()
+        order_numpy = with_numpy.rank_results()
+        without_numpy = make_searcher()
+        with mock.patch.object(osinttool, "np", None):
+            order_python = without_numpy.rank_results()
+
+        self.assertEqual(order_numpy, order_python)
+        for name in order_numpy:
+            self.assertAlmostEqual(with_numpy.results["search_results"][name]["score"],
+                                   without_numpy.results["search_results"][name]["score"], places=4)
+
+    def test_relevant_results_rank_first(self):
+        searcher = make_searcher()
+        order = searcher.rank_results()
+        self.assertEqual(order[0], "Profile Page")
+        self.assertLess(order.index("Google Search (Jane Doe)"), order.index("Generic Directory"))
+        self.assertGreater(order.index("Broken Page"), order.index("Google Search (Jane Doe)"))
+        self.assertEqual(list(searcher.results["search_results"]), order)
+
+    def test_top_results_uses_scores(self):
+        searcher = make_searcher()
+        order = searcher.rank_results()
+        self.assertEqual([name for name, _ in searcher.top_results(3)], order[:3])
+
+    def test_ranking_is_stable_for_equal_scores(self):
+        searcher = osinttool.EnhancedOSINTSearcher()
+        searcher.results["subject_info"] = {"name": "Jane Doe"}
+        searcher.results["search_results"] = {
+            name: {"url": f"https://example.com/{name}", "category": "Other", "info": ""} for name in "abcde"
+        }
+        results_before = copy.deepcopy(searcher.results["search_results"])
+        self.assertEqual(searcher.rank_results(), list("abcde"))
+        self.assertEqual(set(searcher.results["search_results"]), set(results_before))
+
+    def test_empty_results(self):
+        searcher = osinttool.EnhancedOSINTSearcher()
+        searcher.results["subject_info"] = {"name": "Jane Doe"}
+        self.assertEqual(searcher.rank_results(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()